@@ -2,7 +2,6 @@
 , python3
 , fetchFromGitHub
 , makeWrapper
-, inputmodule-control
 , pulseaudio
 }:
 
@@ -31,7 +30,6 @@ python3.pkgs.buildPythonApplication rec {
     scipy # Required for equalizer plugin
     sounddevice # Required for equalizer plugin
     pulsectl # Required for equalizer plugin
-    inputmodule-control # Required runtime binary for equalizer plugin LED output
     # Note: iplocate is not available in nixpkgs - time_weather_plugin will need to handle this gracefully
   ];
 
@@ -58,7 +56,7 @@ python3.pkgs.buildPythonApplication rec {
     makeWrapper ${python3.withPackages (ps: with ps; [ pyserial numpy psutil evdev pynput pyyaml python-dotenv requests scipy sounddevice pulsectl ])}/bin/python $out/bin/led-matrix-monitor \
       --add-flags "$out/lib/python${python3.pythonVersion}/site-packages/main.py" \
       --prefix PYTHONPATH : "$out/lib/python${python3.pythonVersion}/site-packages" \
-      --prefix PATH : "${lib.makeBinPath [ inputmodule-control pulseaudio ]}"
+      --prefix PATH : "${lib.makeBinPath [ pulseaudio ]}"
   '';
 
   # Skip tests for now since there aren't any
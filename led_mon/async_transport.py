@@ -0,0 +1,258 @@
+# Built In Dependencies
+import asyncio
+import threading
+import logging
+import queue
+import os
+
+# Internal Dependencies
+from led_mon.commands import Commands
+from led_mon.drawing import FrameEncoder, Overlay, MAGIC, PANEL_WIDTH, PANEL_HEIGHT, FRAME_DTYPE, init_device, read_brightness, hold_frame
+
+# External Dependencies
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# A write that cannot be completed within this time means the panel has stalled; it is then reopened
+WRITE_DEADLINE_SEC = 0.5
+RECONNECT_BACKOFF_SEC = 0.5
+MAX_RECONNECT_BACKOFF_SEC = 8.0
+
+
+def animate_packet(animate):
+    return bytes([*MAGIC, Commands.Animate, bool(animate)])
+
+
+class AsyncTransport:
+    """One asyncio event loop, on one thread, that drives every panel opened in async mode."""
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='led-matrix-transport', daemon=True)
+        self.thread.start()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+_transport = None
+_transport_lock = threading.Lock()
+
+def get_transport():
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = AsyncTransport()
+        return _transport
+
+
+class AsyncPanel:
+    """Async counterpart of DrawingThread: the only owner of one panel's serial port.
+
+    Producers use the same FrameMailbox as with a DrawingThread. The panel's
+    coroutine is woken by the mailbox instead of blocking on it, and writes to the
+    tty file descriptor without blocking: when the kernel buffer is full it waits
+    for the descriptor to become writable, up to write_deadline_sec. Meanwhile new
+    frames are coalesced in the mailbox, so a slow panel only ever gets the latest
+    frame. A panel that misses its deadline or fails a write is closed and reopened
+    by a reconnect coroutine with exponential back-off; the latest frame is drawn
+    again once it is back.
+    """
+    def __init__(self, port_location, input_queue, write_deadline_sec=WRITE_DEADLINE_SEC):
+        self.transport = get_transport()
+        self.port_location = port_location
+        self.input_queue = input_queue
+        self.write_deadline_sec = write_deadline_sec
+        self.frame_encoder = FrameEncoder(draw_bw=True)
+        self.animate_active = False
+        # The frame on the panel, kept to put back after an overlay or a reconnect
+        self.last_grid = None
+        self._held_grid = np.zeros((PANEL_WIDTH, PANEL_HEIGHT), dtype=FRAME_DTYPE)
+        self.ref_count = 0
+        self.bytes_written = 0
+        self.deadline_misses = 0
+        self.serial_port = init_device(self.port_location)
+        self.frame_encoder.set_base_brightness(read_brightness(self.serial_port))
+        self._fd = self.serial_port.fileno()
+        self._redraw = False
+        self._wakeup = None
+        self._reconnect_task = None
+        self._future = None
+
+    @property
+    def frames_skipped(self):
+        return self.frame_encoder.frames_skipped
+
+    @property
+    def columns_skipped(self):
+        return self.frame_encoder.columns_skipped
+
+    def set_animate(self, animate):
+        # Only used before start(); the state is written out when the coroutine starts
+        self.animate_active = animate
+        self.frame_encoder.reset()
+
+    def start(self):
+        self._future = self.transport.submit(self._run())
+
+    def is_alive(self):
+        return self._future is not None and not self._future.done()
+
+    def join(self, timeout=None):
+        if self._future is None:
+            return
+        try:
+            self._future.result(timeout)
+        except Exception:
+            pass
+
+    async def _wait_writable(self, fd):
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        loop.add_writer(fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            loop.remove_writer(fd)
+
+    async def _write(self, data, fd=None):
+        fd = self._fd if fd is None else fd
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.write_deadline_sec
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(fd, view)
+                view = view[written:]
+                self.bytes_written += written
+            except BlockingIOError:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self.deadline_misses += 1
+                    raise TimeoutError(f"write deadline of {self.write_deadline_sec}s missed")
+                try:
+                    await asyncio.wait_for(self._wait_writable(fd), remaining)
+                except asyncio.TimeoutError:
+                    self.deadline_misses += 1
+                    raise TimeoutError(f"write deadline of {self.write_deadline_sec}s missed")
+
+    async def _send_frame(self, grid):
+        packet = self.frame_encoder.encode_changes(grid)
+        if packet is not None:
+            await self._write(packet)
+
+    async def _play_overlay(self, overlay):
+        if self.animate_active:
+            await self._write(animate_packet(False))
+        for frame in overlay.frames + [self.last_grid]:
+            # The last "frame" puts back what the panel was showing before the overlay
+            if frame is None:
+                break
+            await self._send_frame(frame)
+            await asyncio.sleep(overlay.frame_time)
+        if self.animate_active:
+            await self._write(animate_packet(True))
+            self.frame_encoder.reset()
+
+    async def _draw(self, item):
+        if isinstance(item, Overlay):
+            await self._play_overlay(item)
+            return
+        grid, animate = item
+        if animate == self.animate_active:
+            # Unchanged, so there is no Animate command to send and the last frame still holds
+            animate = None
+        if animate is not None:
+            self.animate_active = animate
+            # Animation scrolls the panel contents, so the last frame no longer matches
+            self.frame_encoder.reset()
+        if not self.animate_active:
+            self.last_grid = hold_frame(grid, self._held_grid)
+            await self._send_frame(self.last_grid)
+        if animate is not None:
+            await self._write(animate_packet(animate))
+
+    def _disconnect(self):
+        # Whatever is on the panel after a reconnect is unknown, so resend in full
+        self.frame_encoder.reset()
+        if self.serial_port is not None:
+            try:
+                self.serial_port.close()
+            except Exception as e:
+                log.debug(f"Error closing serial port during reconnect: {e}")
+        self.serial_port = None
+        self._fd = None
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self):
+        loop = asyncio.get_running_loop()
+        backoff = RECONNECT_BACKOFF_SEC
+        while not self.input_queue.closed:
+            await asyncio.sleep(backoff)
+            try:
+                # Port discovery and open are blocking, so keep them off the event loop
+                serial_port = await loop.run_in_executor(None, init_device, self.port_location, False)
+                fd = serial_port.fileno()
+                os.set_blocking(fd, False)
+                try:
+                    await self._write(animate_packet(self.animate_active), fd)
+                except Exception:
+                    serial_port.close()
+                    raise
+                self.serial_port, self._fd = serial_port, fd
+                self._redraw = True
+                self._wakeup.set()
+                log.info(f"Reconnected LED panel at location {self.port_location}")
+                return
+            except Exception as e:
+                backoff = min(backoff * 2, MAX_RECONNECT_BACKOFF_SEC)
+                log.warning(f"Unable to reconnect LED panel at {self.port_location}: {e}")
+
+    async def _next_item(self):
+        while True:
+            if self._redraw and self.serial_port is not None:
+                self._redraw = False
+                if self.last_grid is not None:
+                    return self.last_grid, None
+            try:
+                return self.input_queue.get(block=False)
+            except queue.Empty:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self.input_queue.on_ready = lambda: loop.call_soon_threadsafe(self._wakeup.set)
+        os.set_blocking(self._fd, False)
+        try:
+            await self._write(animate_packet(self.animate_active))
+        except Exception as e:
+            log.error(f"Error writing to LED panel at {self.port_location}: {e}")
+            self._disconnect()
+        while True:
+            item = await self._next_item()
+            if item is None:  # Sentinel to exit cleanly
+                break
+            if self.serial_port is None:
+                # The reconnect coroutine is working on it; keep track of what to redraw once it is back
+                if not isinstance(item, Overlay):
+                    grid, animate = item
+                    if animate is not None:
+                        self.animate_active = animate
+                    if not self.animate_active:
+                        self.last_grid = hold_frame(grid, self._held_grid)
+                continue
+            try:
+                await self._draw(item)
+            except Exception as e:
+                log.error(f"Error writing to LED panel at {self.port_location}: {e}")
+                self._disconnect()
+        # Clean shutdown
+        self.input_queue.on_ready = None
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self.serial_port is not None:
+            self.serial_port.close()
+            self.serial_port = None
+        log.debug(f"Async transport for LED panel at {self.port_location} exited cleanly")
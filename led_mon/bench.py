@@ -0,0 +1,172 @@
+# Headless benchmark for `led_system_monitor --bench <frames>`.
+# Runs the render loop against emulated panels (see fake_matrix.py) with synthetic, replayed or recorded monitor data,
+# and reports per-app render time, frame time percentiles, bytes sent and CPU time per frame.
+
+# Built In Dependencies
+import os
+import sys
+import json
+import math
+import time
+import logging
+from collections import defaultdict
+
+# Internal Dependencies
+from led_mon.fake_matrix import start_fake_panels, device_override
+from led_mon.shared_state import DEVICE_OVERRIDE_ENV
+
+# External Dependencies
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+MONITORS = ('cpu', 'memory', 'battery', 'disk', 'network')
+SYNTHETIC_CORES = 8
+# Time for the panel transports to write out the last frames before the byte counts are read
+DRAIN_SEC = 0.3
+
+
+def synthetic_sample(frame):
+    """Deterministic, slowly varying values shaped like the monitors' get() results."""
+    t = frame * 0.1
+    wave = lambda period, phase=0.0: 0.5 + 0.5 * math.sin(2 * math.pi * t / period + phase)
+    return {
+        'cpu': [wave(7.0, core) for core in range(SYNTHETIC_CORES)],
+        'memory': 0.3 + 0.4 * wave(30.0),
+        'battery': [0.2 + 0.7 * wave(60.0), (frame // 50) % 2 == 0],
+        'disk': [wave(3.0), wave(5.0, 1.0)],
+        'network': [wave(4.0, 2.0), wave(2.5)],
+        'brightness': 0.6,
+    }
+
+
+class BenchMonitor:
+    """Stands in for one of the monitors in monitors.py, returning the current frame's sample."""
+    def __init__(self, bench, name, live=None):
+        self.bench = bench
+        self.name = name
+        self.live = live
+
+    def get(self):
+        if self.live is not None:
+            value = self.live.get()
+            self.bench.sample[self.name] = list(value) if isinstance(value, tuple) else value
+            return value
+        value = self.bench.sample[self.name]
+        return tuple(value) if isinstance(value, list) and self.name != 'cpu' else value
+
+
+class Bench:
+    def __init__(self, frames, panels=2, data_file=None, record_file=None, json_file=None, frame_interval=0.0):
+        self.frames = frames
+        self.data_file = data_file
+        self.record_file = record_file
+        self.json_file = json_file
+        self.frame_interval = frame_interval
+        self.samples = None
+        if data_file:
+            with open(data_file, 'r') as f:
+                self.samples = json.load(f)
+        self.recorded = []
+        self.sample = {}
+        self.frame = 0
+        self.frame_times = []
+        self.app_times = defaultdict(list)
+        # Point panel discovery at emulated panels before the app looks for devices
+        self.panels = start_fake_panels(panels)
+        os.environ[DEVICE_OVERRIDE_ENV] = device_override(self.panels)
+
+    @property
+    def data_source(self):
+        if self.record_file:
+            return 'live'
+        return 'replay' if self.samples else 'synthetic'
+
+    def monitors(self, cpu, memory, battery, disk, network):
+        """Replacements for the app's monitors; live ones are only called when recording."""
+        live = dict(zip(MONITORS, (cpu, memory, battery, disk, network)))
+        recording = bool(self.record_file)
+        return [BenchMonitor(self, name, live[name] if recording else None) for name in MONITORS]
+
+    def brightness(self):
+        if self.record_file:
+            from led_mon.monitors import get_monitor_brightness
+            self.sample['brightness'] = get_monitor_brightness()
+        return self.sample['brightness']
+
+    def _next_sample(self):
+        if self.record_file:
+            return {}
+        if self.samples:
+            return dict(self.samples[self.frame % len(self.samples)])
+        return synthetic_sample(self.frame)
+
+    def record_app(self, name, seconds):
+        self.app_times[name].append(seconds)
+
+    def run(self, render_iteration, args):
+        for panel in self.panels:
+            panel.reset_stats()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for self.frame in range(self.frames):
+            self.sample = self._next_sample()
+            start = time.perf_counter()
+            render_iteration(args)
+            self.frame_times.append(time.perf_counter() - start)
+            if self.record_file:
+                self.recorded.append(self.sample)
+        wall_sec = time.perf_counter() - wall_start
+        cpu_sec = time.process_time() - cpu_start
+        time.sleep(DRAIN_SEC)
+        return self.report(wall_sec, cpu_sec)
+
+    def report(self, wall_sec, cpu_sec):
+        frame_ms = np.array(self.frame_times) * 1000
+        percentiles = lambda ms: {
+            f"p{p}": float(np.percentile(ms, p)) for p in (50, 90, 99)
+        } | {'mean': float(ms.mean()), 'max': float(ms.max())}
+        panel_stats = [p.stats() for p in self.panels]
+        return {
+            'frames': self.frames,
+            'data': self.data_source,
+            'wall_sec': wall_sec,
+            'cpu_ms_per_frame': cpu_sec * 1000 / self.frames,
+            'frame_ms': percentiles(frame_ms),
+            'apps_ms': {name: percentiles(np.array(times) * 1000) | {'calls': len(times)}
+                        for name, times in sorted(self.app_times.items())},
+            'bytes_sent': sum(s['bytes'] for s in panel_stats),
+            'bytes_per_frame': sum(s['bytes'] for s in panel_stats) / self.frames,
+            'panels': [
+                {k: s[k] for k in ('location', 'bytes', 'frames', 'bad_bytes', 'commands')}
+                for s in panel_stats
+            ],
+        }
+
+    def finish(self, result):
+        if self.record_file:
+            with open(self.record_file, 'w') as f:
+                json.dump(self.recorded, f)
+        if self.json_file == '-':
+            print(json.dumps(result, indent=2))
+        else:
+            print_report(result)
+            if self.json_file:
+                with open(self.json_file, 'w') as f:
+                    json.dump(result, f, indent=2)
+        sys.stdout.flush()
+        # Plugins may leave non-daemon timers behind, which would keep the process alive
+        os._exit(0)
+
+
+def print_report(result):
+    frame = result['frame_ms']
+    print(f"{result['frames']} frames ({result['data']} data) in {result['wall_sec']:.2f}s")
+    print(f"   frame time ms: p50 {frame['p50']:.3f}  p90 {frame['p90']:.3f}  p99 {frame['p99']:.3f}  max {frame['max']:.3f}")
+    print(f"   cpu time per frame: {result['cpu_ms_per_frame']:.3f} ms")
+    print(f"   bytes sent: {result['bytes_sent']} ({result['bytes_per_frame']:.1f} per frame)")
+    for panel in result['panels']:
+        print(f"      {panel['location']}: {panel['bytes']} bytes, {panel['frames']} frames drawn")
+    print("   app render time ms (mean / p99 / calls):")
+    for name, times in result['apps_ms'].items():
+        print(f"      {name.ljust(16)}{times['mean']:8.3f} {times['p99']:8.3f} {times['calls']:8d}")
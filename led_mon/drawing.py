@@ -8,9 +8,12 @@ import os
 import re
 import json
 import logging
+import queue
 
 # Internal Dependencies
-from led_mon.commands import Commands, send_command, do_animate
+from led_mon.commands import Commands, do_animate
+from led_mon.shared_state import get_device_overrides
+from led_mon.snapshot_pack import SnapshotPack, PACK_SUFFIX, decode_snapshot, unpack_bits
 from led_mon.patterns import lightning_bolt_bot, lightning_bolt_top, lookup_table, id_patterns, symbols, numerals, icons
 
 # External Dependencies
@@ -94,20 +97,69 @@ def draw_bar(grid, bar_ratio, bar_value, bar_x_offset = 1, y=0):
         else:
             grid[bar_x_offset+i,1:1+pixels_col] = bar_value
             
+# How long each frame of a multi-frame snapshot is shown, unless the app sets frame-duration
+SNAPSHOT_FRAME_SEC = 0.1
+# Decoded, transposed snapshots by (path, panel, file), with the resolved file path, mtime and size they were read at
+snapshot_cache = {}
+# Open snapshot packs by pack file, with the mtime and size they were opened at
+snapshot_packs = {}
+
+def load_snapshot(path, panel, file):
+    """Return the snapshot's frames as an (n, 9, 34) array, reading the file again only when it has changed.
+
+    path is a directory of json snapshots or a snapshot pack (see snapshot_pack.py), relative to this file.
+    """
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    snap_dir = os.path.join(current_dir, path)
+    if snap_dir.endswith(PACK_SUFFIX):
+        return load_packed_snapshot(snap_dir, panel, file)
+    # Per-panel snapshots live in a left or right subdir, if there is one
+    subdir = panel if panel in ('left', 'right') and os.path.isdir(os.path.join(snap_dir, panel)) else ''
+    file_path = os.path.join(snap_dir, subdir, file)
+    stat = os.stat(file_path)
+    version = (file_path, stat.st_mtime_ns, stat.st_size)
+    key = (path, panel, file)
+    cached = snapshot_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    with open(file_path) as f:
+        snap = decode_snapshot(json.load(f), file)
+    snap.flags.writeable = False
+    snapshot_cache[key] = (version, snap)
+    return snap
+
+def load_packed_snapshot(pack_file, panel, file):
+    stat = os.stat(pack_file)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = snapshot_packs.get(pack_file)
+    if cached is None or cached[0] != version:
+        # Views handed out earlier keep the old mapping alive, so it is not closed here
+        cached = snapshot_packs[pack_file] = (version, SnapshotPack(pack_file))
+    pack = cached[1]
+    name = f"{panel}/{file}" if f"{panel}/{file}" in pack else file
+    if name not in pack:
+        raise FileNotFoundError(f"{file} is not in {pack_file}")
+    if pack.entries[name]['format'] == 'uint8':
+        return pack.frames(name)
+    # Bit-packed frames are unpacked once per pack version, like json snapshots are decoded once
+    key = (pack_file, version, name)
+    if key not in snapshot_cache:
+        snapshot_cache[key] = (version, unpack_bits(pack.frames(name)))
+    return snapshot_cache[key][1]
+
 warned = set()
 def draw_snapshot(grid, fill_value, **kwargs):
     global warned
     path = kwargs.get('path', None)
     panel = kwargs.get('panel', None)
     file = kwargs.get('file', None)
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    path = os.path.join(current_dir, path)
-    subdirs = [ f.name for f in os.scandir(path) if f.is_dir() and f.name in ['left', 'right']]
-    subdir = panel if panel in subdirs else ''
+    # Snapshots with several frames are played as an animation, one frame per frame-duration seconds
+    frame_duration = kwargs.get('frame-duration', SNAPSHOT_FRAME_SEC)
     try:
-        with open(os.path.join(path, subdir, file)) as f:
-            snap = json.load(f)
-            grid[:,:] = np.array(snap).T * fill_value
+        frames = load_snapshot(path, panel, file)
+        frame = frames[int(time.time() / frame_duration) % len(frames)]
+        # Multiply in int32 and clamp to the LED range: uint8 or int16 products of a greyscale pixel and fill_value would wrap
+        np.clip(np.multiply(frame, fill_value, dtype=np.int32), 0, 255, out=grid, casting='unsafe')
     except FileNotFoundError as e:
         if not file in warned:
             print(f"File {file} not found")
@@ -254,19 +306,196 @@ def draw_id(grid, id, fill_value, args=None):
     fill_grid = id_patterns[id]
     grid[:,:] = fill_grid * fill_value
 
-def draw_to_LEDs(s, grid):
-    # Ensure all values are valid bytes before sending
-    safe_grid = np.clip(grid, 0, 255).astype(np.uint8)
-    for i in range(safe_grid.shape[0]):
-        params = bytearray([i]) + bytearray(safe_grid[i, :].tolist())
-        send_command(s, Commands.StageCol, parameters=params)
-    send_command(s, Commands.FlushCols)
+# Command packets are prefixed with these magic bytes (see commands.py)
+MAGIC = (0x32, 0xAC)
+PANEL_WIDTH = 9
+PANEL_HEIGHT = 34
+# Magic + command id + column index + one byte per row
+STAGE_COL_PACKET_LEN = 3 + 1 + PANEL_HEIGHT
+FLUSH_COLS_PACKET = bytes([*MAGIC, Commands.FlushCols])
+# Magic + command id + level
+BRIGHTNESS_PACKET_LEN = 3 + 1
+# DrawBW takes one bit per pixel, 9x34 = 306 bits packed into 39 bytes
+DRAW_BW_LEN = (PANEL_WIDTH * PANEL_HEIGHT + 7) // 8
+# The firmware pads every response to this many bytes
+RESPONSE_SIZE = 32
+# Assumed global brightness of a module that does not report its own
+DEFAULT_HW_BRIGHTNESS = 255
+
+def read_brightness(s, timeout=0.5):
+    """Ask the module for its global brightness. Returns None if it does not answer."""
+    previous_timeout = s.timeout
+    s.timeout = timeout
+    try:
+        s.reset_input_buffer()
+        # Brightness without a level is a query
+        s.write(bytes([*MAGIC, Commands.Brightness]))
+        response = s.read(RESPONSE_SIZE)
+    finally:
+        s.timeout = previous_timeout
+    return response[0] if response else None
+
+class FrameEncoder:
+    """Encodes a 9x34 grid as StageCol x9 + FlushCols in one reusable buffer.
+
+    The packet headers are written once, when the encoder is created. Each frame
+    only overwrites the pixel bytes, through a numpy view onto the buffer, so the
+    whole frame can be sent to the panel with a single write.
+
+    encode_changes() also remembers the last frame it produced, and only emits
+    the columns that differ from it (or nothing at all for an identical frame).
+    With draw_bw enabled, frames made of zeros and a single foreground level are
+    sent as one packed DrawBW bitmap, preceded by a Brightness command when the
+    level changes. Call reset() whenever the panel contents are no longer known,
+    e.g. after a reconnect or an animation, so the next frame is sent in full.
+
+    The firmware scales every pixel by its global brightness, which the user may
+    have set. That level (base_brightness, see set_base_brightness()) is kept for
+    greyscale frames, and DrawBW frames set the global brightness to their pixel
+    level scaled by it, so both kinds of frame look the same.
+    """
+    def __init__(self, draw_bw=False, base_brightness=DEFAULT_HW_BRIGHTNESS):
+        self.draw_bw = draw_bw
+        self.base_brightness = base_brightness
+        # Every buffer reserves room for a leading Brightness command, which is
+        # only included in the returned view when the hardware level must change
+        cols_start = BRIGHTNESS_PACKET_LEN
+        self.buffer = bytearray(cols_start + STAGE_COL_PACKET_LEN * PANEL_WIDTH + len(FLUSH_COLS_PACKET))
+        self.buffer[:3] = bytes([*MAGIC, Commands.Brightness])
+        for col in range(PANEL_WIDTH):
+            offset = cols_start + col * STAGE_COL_PACKET_LEN
+            self.buffer[offset:offset+4] = bytes([*MAGIC, Commands.StageCol, col])
+        self.buffer[-len(FLUSH_COLS_PACKET):] = FLUSH_COLS_PACKET
+        packets = np.frombuffer(self.buffer, dtype=np.uint8, count=STAGE_COL_PACKET_LEN * PANEL_WIDTH, offset=cols_start)
+        # (9, 34) view of the pixel bytes of each StageCol packet
+        self.pixels = packets.reshape(PANEL_WIDTH, STAGE_COL_PACKET_LEN)[:, 4:]
+        self._view = memoryview(self.buffer)
+        # Scratch buffer for frames where only some of the columns changed
+        self._partial = bytearray(self.buffer)
+        self._partial_view = memoryview(self._partial)
+        self._bw = bytearray([*MAGIC, Commands.Brightness, 0, *MAGIC, Commands.DrawBW]) + bytearray(DRAW_BW_LEN)
+        self._bw_view = memoryview(self._bw)
+        self.last_frame = np.zeros((PANEL_WIDTH, PANEL_HEIGHT), dtype=np.uint8)
+        self.last_frame_valid = False
+        # False when the firmware's staged columns differ from last_frame (after a DrawBW)
+        self.staged_valid = False
+        self.hw_brightness = None
+        self.frames_skipped = 0
+        self.columns_skipped = 0
+        self.bw_frames = 0
 
+    def reset(self):
+        self.last_frame_valid = False
+        self.staged_valid = False
+        self.hw_brightness = None
+
+    def set_base_brightness(self, level):
+        """Use the module's global brightness, as read at connect, as the reference level."""
+        if level is None:
+            log.warning(f"LED panel did not report its brightness, assuming {DEFAULT_HW_BRIGHTNESS}")
+            return
+        self.base_brightness = level
+        self.hw_brightness = level
+
+    def encode(self, grid):
+        # Ensure all values are valid bytes before sending. The clamp is done in place,
+        # so grid should be a frame no producer is still writing (see hold_frame)
+        if isinstance(grid, np.ndarray) and grid.dtype != np.uint8 and grid.flags.writeable:
+            np.clip(grid, 0, 255, out=grid)
+            np.copyto(self.pixels, grid, casting='unsafe')
+        else:
+            np.copyto(self.pixels, np.clip(grid, 0, 255), casting='unsafe')
+        return self._view[BRIGHTNESS_PACKET_LEN:]
+
+    def _with_brightness(self, buffer, view, end, level):
+        if self.hw_brightness == level:
+            return view[BRIGHTNESS_PACKET_LEN:end]
+        buffer[3] = level
+        self.hw_brightness = level
+        return view[:end]
+
+    def _encode_bw(self, level):
+        bits = np.packbits(self.pixels.T != 0, axis=None, bitorder='little')
+        self._bw[-DRAW_BW_LEN:] = bits.tobytes()
+        self.bw_frames += 1
+        self.staged_valid = False
+        if level == 0:
+            # Nothing is lit, so the hardware level does not matter
+            return self._bw_view[BRIGHTNESS_PACKET_LEN:]
+        return self._with_brightness(self._bw, self._bw_view, len(self._bw), max(1, level * self.base_brightness // 255))
+
+    def encode_changes(self, grid):
+        """Return the packet bytes needed to show grid, or None if it is already displayed."""
+        self.encode(grid)
+        if self.last_frame_valid and np.array_equal(self.pixels, self.last_frame):
+            self.frames_skipped += 1
+            self.columns_skipped += PANEL_WIDTH
+            return None
+
+        if self.draw_bw:
+            level = self.pixels.max()
+            if np.all((self.pixels == 0) | (self.pixels == level)):
+                np.copyto(self.last_frame, self.pixels)
+                self.last_frame_valid = True
+                return self._encode_bw(int(level))
+
+        if self.staged_valid:
+            changed_cols = np.flatnonzero((self.pixels != self.last_frame).any(axis=1))
+        else:
+            changed_cols = range(PANEL_WIDTH)
+        np.copyto(self.last_frame, self.pixels)
+        self.last_frame_valid = True
+        self.staged_valid = True
+        if len(changed_cols) == PANEL_WIDTH:
+            return self._with_brightness(self.buffer, self._view, len(self.buffer), self.base_brightness)
+        self.columns_skipped += PANEL_WIDTH - len(changed_cols)
+        for i, col in enumerate(changed_cols):
+            src = BRIGHTNESS_PACKET_LEN + col * STAGE_COL_PACKET_LEN
+            dst = BRIGHTNESS_PACKET_LEN + i * STAGE_COL_PACKET_LEN
+            self._partial[dst:dst+STAGE_COL_PACKET_LEN] = self._view[src:src+STAGE_COL_PACKET_LEN]
+        end = BRIGHTNESS_PACKET_LEN + len(changed_cols) * STAGE_COL_PACKET_LEN
+        self._partial[end:end+len(FLUSH_COLS_PACKET)] = FLUSH_COLS_PACKET
+        return self._with_brightness(self._partial, self._partial_view, end+len(FLUSH_COLS_PACKET), self.base_brightness)
+
+# Renderers can push pixels out of range while drawing (draw_battery goes negative), so frames are int16 rather than uint8
+FRAME_DTYPE = np.int16
+
+class FrameRing:
+    """A few preallocated frame buffers that one producer rotates through.
+
+    A frame handed to a DrawingThread is still read after put() returns: when it
+    is encoded, and again if the panel comes back to this producer after another
+    one drew over it. So each frame is drawn into the next buffer of the ring,
+    and the ring only moves on once that frame has been put (advance()). A buffer
+    is reused after size - 1 newer frames from the same producer. Transports copy
+    the frame they show into a buffer of their own (hold_frame()), so the frame
+    they put back after an overlay never changes under them.
+    """
+    def __init__(self, size=4):
+        self.buffers = np.zeros((size, PANEL_WIDTH, PANEL_HEIGHT), dtype=FRAME_DTYPE)
+        self._next = 0
+
+    def frame(self):
+        """Return the cleared buffer to draw the next frame into."""
+        grid = self.buffers[self._next]
+        grid.fill(0)
+        return grid
+
+    def advance(self):
+        self._next = (self._next + 1) % len(self.buffers)
+
+def hold_frame(grid, held):
+    """Copy grid into held, a transport's own frame buffer, clamped so encoding it changes nothing."""
+    np.clip(grid, 0, 255, out=held, casting='unsafe')
+    return held
 
 def init_device(location = "1-3.2", fatal=True):
     try:
         # VID = 1234
         # PID = 5678
+        for override_location, override_device in get_device_overrides() or []:
+            if override_location == location:
+                return serial.Serial(override_device, 115200)
         device_list = list_ports.comports()
         for device in device_list:
             if device.location and device.location.startswith(location):
@@ -280,22 +509,170 @@ def init_device(location = "1-3.2", fatal=True):
         raise
 
 
+class Overlay:
+    """A short animation drawn over whatever a panel is showing, e.g. a notification cue."""
+    def __init__(self, frames, frame_time):
+        self.frames = frames
+        self.frame_time = frame_time
+
+
+# Frame producer priorities on a panel. The highest priority producer with a frame owns the panel.
+PRIORITY_APPS = 0        # Main loop app rotation
+PRIORITY_EQUALIZER = 10  # Persistent-draw equalizer
+PRIORITY_ID = 20         # App ID display while the ID key combo is held
+# Overlays (notification cues) are played ahead of every priority
+
+class FrameMailbox:
+    """Latest-frame-wins hand-off between a panel's frame producers and its DrawingThread.
+
+    Each producer puts frames at its own priority, into its own single slot. put()
+    never blocks: a frame that has not been picked up yet is replaced by the new
+    one and counted in frames_coalesced. An animate change carried by a replaced
+    frame is folded into its replacement, so animation state transitions are never lost.
+
+    The highest priority producer that has put a frame owns the panel until it calls
+    release(). Lower priority frames are held back meanwhile; when ownership returns
+    to their producer, its latest frame and animation state are drawn again. Frames
+    put at a released priority are dropped, so a producer thread that races its own
+    release cannot take the panel back; it opts back in with claim().
+
+    put_overlay() queues an Overlay, which get() returns ahead of any frame.
+    Putting None (or calling close()) stops the reader. A reader that cannot block
+    in get() (the async transport) sets on_ready, which is called whenever get() may
+    have something new.
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._latest = {}      # priority -> latest (grid, animate) from that producer
+        self._animate = {}     # priority -> last animate state requested by that producer
+        self._pending = set()  # priorities whose latest frame has not been picked up yet
+        self._released = set() # priorities whose frames are dropped until they are claimed again
+        self._drawn_owner = None
+        self._overlay = None
+        self._closed = False
+        self.frames_coalesced = 0
+        self.on_ready = None
+
+    def _notify(self):
+        self._cond.notify()
+        if self.on_ready is not None:
+            self.on_ready()
+
+    def _owner(self):
+        return max(self._latest) if self._latest else None
+
+    def put(self, item, block=False, timeout=None, priority=PRIORITY_APPS):
+        if item is None:
+            self.close()
+            return
+        with self._cond:
+            if priority in self._released:
+                return
+            grid, animate = item
+            if priority in self._pending:
+                self.frames_coalesced += 1
+                _, stale_animate = self._latest[priority]
+                if animate is None and stale_animate is not None:
+                    item = (grid, stale_animate)
+            if animate is not None:
+                self._animate[priority] = animate
+            self._latest[priority] = item
+            self._pending.add(priority)
+            self._notify()
+
+    def put_nowait(self, item, priority=PRIORITY_APPS):
+        self.put(item, priority=priority)
+
+    def put_overlay(self, overlay):
+        with self._cond:
+            self._overlay = overlay
+            self._notify()
+
+    def claim(self, priority):
+        """Accept frames at priority again after a release()."""
+        with self._cond:
+            self._released.discard(priority)
+
+    def release(self, priority):
+        """Drop a producer's claim on the panel, handing it back to the next lower priority.
+        Later frames at priority are dropped until claim() is called."""
+        with self._cond:
+            self._released.add(priority)
+            if self._latest.pop(priority, None) is None:
+                return
+            self._animate.pop(priority, None)
+            self._pending.discard(priority)
+            owner = self._owner()
+            if owner is not None and owner < priority:
+                self._pending.add(owner)
+                self._notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._notify()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def get(self, block=True, timeout=None):
+        with self._cond:
+            ready = lambda: self._closed or self._overlay is not None or self._owner() in self._pending
+            if block and not self._cond.wait_for(ready, timeout):
+                raise queue.Empty
+            if self._closed:
+                return None
+            if self._overlay is not None:
+                overlay, self._overlay = self._overlay, None
+                return overlay
+            owner = self._owner()
+            if owner not in self._pending:
+                raise queue.Empty
+            self._pending.discard(owner)
+            grid, animate = self._latest[owner]
+            if animate is None and owner != self._drawn_owner:
+                # Another producer was drawing; restore this one's animation state
+                animate = self._animate.get(owner)
+            self._latest[owner] = (grid, None)
+            self._drawn_owner = owner
+            return grid, animate
+
+
 class DrawingThread(threading.Thread):
+    """The only owner of a panel's serial port. Frame producers submit to its input_queue."""
     def __init__(self, port_location, input_queue):
         super().__init__()
         self.daemon = True
         self.port_location = port_location
         self.serial_port = init_device(self.port_location)
         self.input_queue = input_queue
+        self.frame_encoder = FrameEncoder(draw_bw=True)
+        self.frame_encoder.set_base_brightness(read_brightness(self.serial_port))
         self.animate_active= False
+        # The frame on the panel, kept to put back after an overlay
+        self.last_grid = None
+        self._held_grid = np.zeros((PANEL_WIDTH, PANEL_HEIGHT), dtype=FRAME_DTYPE)
+        self.ref_count = 0
         self._reconnect_backoff_sec = 0.5
         self._max_reconnect_backoff_sec = 8.0
         self._next_reconnect_time = 0.0
 
+    @property
+    def frames_skipped(self):
+        return self.frame_encoder.frames_skipped
+
+    @property
+    def columns_skipped(self):
+        return self.frame_encoder.columns_skipped
+
     def set_animate(self, animate):
         do_animate(self.serial_port, animate=animate)
+        self.frame_encoder.reset()
 
     def _close_serial_port(self):
+        # Whatever is on the panel after a reconnect is unknown, so resend in full
+        self.frame_encoder.reset()
         if self.serial_port is None:
             return
         try:
@@ -321,23 +698,50 @@ class DrawingThread(threading.Thread):
             self._reconnect_backoff_sec = min(self._reconnect_backoff_sec * 2, self._max_reconnect_backoff_sec)
             log.warning(f"Unable to reconnect LED panel at {self.port_location}: {e}")
             return False
-    
+
+    def _play_overlay(self, overlay):
+        if self.animate_active:
+            do_animate(self.serial_port, False)
+        for frame in overlay.frames + [self.last_grid]:
+            # The last "frame" puts back what the panel was showing before the overlay
+            if frame is None:
+                break
+            packet = self.frame_encoder.encode_changes(frame)
+            if packet is not None:
+                self.serial_port.write(packet)
+            time.sleep(overlay.frame_time)
+        if self.animate_active:
+            do_animate(self.serial_port, True)
+            self.frame_encoder.reset()
+
     def run(self):
         while True:
             try:
                 item = self.input_queue.get()
                 if item is None:  # Sentinel to exit cleanly
                     break
+                if isinstance(item, Overlay):
+                    if self.serial_port is not None or self._attempt_reconnect():
+                        self._play_overlay(item)
+                    continue
                 grid, animate = item
+                if animate == self.animate_active:
+                    # Unchanged, so there is no Animate command to send and the last frame still holds
+                    animate = None
 
                 if animate is not None:
                     self.animate_active = animate
+                    # Animation scrolls the panel contents, so the last frame no longer matches
+                    self.frame_encoder.reset()
 
                 if self.serial_port is None and not self._attempt_reconnect():
                     continue
 
                 if not self.animate_active:
-                    draw_to_LEDs(self.serial_port, grid)
+                    self.last_grid = hold_frame(grid, self._held_grid)
+                    packet = self.frame_encoder.encode_changes(self.last_grid)
+                    if packet is not None:
+                        self.serial_port.write(packet)
                 if animate is not None:
                     do_animate(self.serial_port, animate)
 
@@ -351,12 +755,65 @@ class DrawingThread(threading.Thread):
         # Clean shutdown
         self._close_serial_port()
         log.debug("DrawingThread exited cleanly")
+
+
+# 'thread' gives each panel its own DrawingThread with blocking writes,
+# 'async' drives every panel from one asyncio event loop (see async_transport.py)
+TRANSPORTS = ('thread', 'async')
+transport = os.environ.get('LED_MATRIX_TRANSPORT', 'thread').lower()
+
+# One transport per panel location, shared by every frame producer in the process
+_panels = {}
+_panels_lock = threading.Lock()
+
+def acquire_panel(location):
+    """Return the running transport (DrawingThread or AsyncPanel) for the panel at location, opening the panel if needed."""
+    with _panels_lock:
+        panel = _panels.get(location)
+        if panel is None:
+            if transport == 'async':
+                from led_mon.async_transport import AsyncPanel
+                panel = AsyncPanel(location, FrameMailbox())
+            else:
+                panel = DrawingThread(location, FrameMailbox())
+            panel.set_animate(False)
+            panel.start()
+            _panels[location] = panel
+            log.debug(f"Opened LED panel at location {location}")
+        panel.ref_count += 1
+        return panel
+
+def release_panel(panel, priority=None):
+    """Drop one reference to panel, and its producer's claim if priority is given.
+    The serial port is closed when the last user releases it."""
+    if priority is not None:
+        panel.input_queue.release(priority)
+    with _panels_lock:
+        panel.ref_count -= 1
+        if panel.ref_count > 0:
+            return
+        if _panels.get(panel.port_location) is panel:
+            del _panels[panel.port_location]
+    panel.input_queue.close()  # Stops the panel's transport
+
+def draw_overlay(frames, frame_time, locations=None):
+    """Play an animated overlay on every open panel (or only those at the given locations)."""
+    overlay = Overlay(frames, frame_time)
+    with _panels_lock:
+        panels = [p for location, p in _panels.items() if locations is None or location in locations]
+    for panel in panels:
+        panel.input_queue.put_overlay(overlay)
+    return bool(panels)
                 
 ###############################################################
 ###           Load metrics functions from plugins           ###
 ###############################################################
+def plugins_disabled():
+    """Plugins are skipped with --disable-plugins (-dp), or when LED_MATRIX_DISABLE_PLUGINS is set (the tests set it)"""
+    return bool(re.search(r"--disable-plugins|-dp", str(sys.argv)) or os.environ.get('LED_MATRIX_DISABLE_PLUGINS'))
+
 # Keep this at the end of the module to avoid circular imports
-if not re.search(r"--disable-plugins|-dp", str(sys.argv)):
+if not plugins_disabled():
     # Try to find plugins directory - either in current dir or installed location
     import os.path
     current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -0,0 +1,154 @@
+# Built-in Dependencies
+from functools import cache
+import logging
+import threading
+
+# External Dependencies
+import numpy as np
+from scipy.signal import butter, sosfilt, sosfilt_zi, sosfiltfilt
+
+log = logging.getLogger(__name__)
+
+ENGINES = ('fft', 'iir', 'stream')
+BAND_LAYOUTS = ('centers', 'log')
+
+# Range covered by the log-spaced band layout
+LOG_LAYOUT_MIN_HZ = 25.0
+LOG_LAYOUT_MAX_HZ = 16000.0
+# FFT bins the fft engine wants inside each band before it lengthens that band's window
+MIN_BAND_BINS = 2
+
+
+def centered_band_edges(band_centers, low_factor, high_factor):
+    return tuple((fc * low_factor, fc * high_factor) for fc in band_centers)
+
+def log_band_edges(num_bands, min_hz=LOG_LAYOUT_MIN_HZ, max_hz=LOG_LAYOUT_MAX_HZ):
+    edges = np.geomspace(min_hz, max_hz, num_bands + 1)
+    return tuple((float(low), float(high)) for low, high in zip(edges[:-1], edges[1:]))
+
+
+@cache
+# Filter coefficients only depend on these parameters, so every Equalizer instance
+# and every restart of Equalizer.run shares one design per band set
+def design_filter_bank(band_edges, sample_rate, order):
+    return tuple(
+        butter(order, [low, high], btype='band', fs=sample_rate, output='sos')
+        for low, high in band_edges
+    )
+
+@cache
+def fft_band_weights(band_edges, sample_rate, chunk_size):
+    freqs = np.fft.rfftfreq(chunk_size, 1.0 / sample_rate)
+    weights = np.zeros((len(band_edges), len(freqs)))
+    for i, (low, high) in enumerate(band_edges):
+        in_band = (freqs >= low) & (freqs < high)
+        if not in_band.any():
+            center = np.sqrt(low * high)
+            in_band[np.argmin(np.abs(freqs - center))] = True
+            log.debug(f"Band {low:.1f}-{high:.1f} Hz is narrower than the FFT bin spacing; using the nearest bin")
+        weights[i, in_band] = 1.0
+    weights.flags.writeable = False
+    return weights
+
+
+class IIRBandEngine:
+    """Band energies from a bank of zero-phase Butterworth band-pass filters, one pass per band."""
+    streaming = False
+
+    def __init__(self, band_edges, sample_rate, order=4):
+        self.filters = design_filter_bank(tuple(band_edges), sample_rate, order)
+
+    def band_rms(self, chunk):
+        return np.array([np.sqrt(np.mean(sosfiltfilt(sos, chunk) ** 2)) for sos in self.filters])
+
+
+def fft_window_size(low, high, sample_rate, chunk_size, max_window):
+    """Smallest power-of-two FFT length, at least chunk_size, that puts MIN_BAND_BINS bins inside the band."""
+    size = chunk_size
+    while size < max_window and sample_rate / size > (high - low) / MIN_BAND_BINS:
+        size *= 2
+    return min(size, max_window)
+
+
+class FFTBandEngine:
+    """Band energies from windowed rffts of the newest audio.
+
+    Each band sums the power of the FFT bins inside its edges, using a precomputed
+    band x bin weight matrix. The result is scaled (Parseval, corrected for the
+    window's power) so it is comparable to the RMS of a band-pass filtered chunk.
+
+    At 1024 samples the bins are 47 Hz apart, wider than the lowest bands, so bands
+    are grouped by the FFT length that resolves them (up to max_window samples) and
+    each group transforms the tail of the chunk it needs. band_rms() therefore takes
+    window_size samples. Bands still narrower than the bin spacing fall back to the
+    bin nearest their center.
+    """
+    streaming = False
+
+    def __init__(self, band_edges, sample_rate, chunk_size, max_window=None):
+        band_edges = tuple(band_edges)
+        max_window = max(chunk_size, max_window or chunk_size)
+        sizes = [fft_window_size(low, high, sample_rate, chunk_size, max_window) for low, high in band_edges]
+        self.num_bands = len(band_edges)
+        self.window_size = max(sizes)
+        # (FFT length, band indices, window, weights, scale) per group of bands
+        self.groups = []
+        for size in sorted(set(sizes)):
+            bands = np.array([i for i, s in enumerate(sizes) if s == size])
+            window = np.hanning(size).astype(np.float32)
+            weights = fft_band_weights(tuple(band_edges[i] for i in bands), sample_rate, size)
+            scale = 2.0 / (size ** 2 * np.mean(window.astype(float) ** 2))
+            self.groups.append((size, bands, window, weights, scale))
+
+    def band_rms(self, chunk):
+        rms = np.empty(self.num_bands)
+        for size, bands, window, weights, scale in self.groups:
+            spectrum = np.fft.rfft(chunk[-size:] * window)
+            power = spectrum.real ** 2 + spectrum.imag ** 2
+            rms[bands] = np.sqrt((weights @ power) * scale)
+        return rms
+
+
+class StreamingBandEngine:
+    """Band energies from a causal filter bank fed with every block of captured audio.
+
+    feed() is called from the audio callback: each block passes once through each
+    band's sosfilt, with the filter state (zi) carried over to the next block, and
+    the squared output is accumulated. band_rms() returns the RMS of everything fed
+    since the previous call, so no audio is skipped or counted twice regardless of
+    the render rate.
+    """
+    streaming = True
+
+    def __init__(self, band_edges, sample_rate, order=4):
+        self.filters = design_filter_bank(tuple(band_edges), sample_rate, order)
+        self.zi = [np.zeros_like(sosfilt_zi(sos)) for sos in self.filters]
+        self._lock = threading.Lock()
+        self._energy = np.zeros(len(self.filters))
+        self._samples = 0
+        self._last_rms = np.zeros(len(self.filters))
+
+    def feed(self, block):
+        energy = np.empty(len(self.filters))
+        for i, sos in enumerate(self.filters):
+            filtered, self.zi[i] = sosfilt(sos, block, zi=self.zi[i])
+            energy[i] = np.dot(filtered, filtered)
+        with self._lock:
+            self._energy += energy
+            self._samples += len(block)
+
+    def band_rms(self, chunk=None):
+        with self._lock:
+            if self._samples:
+                self._last_rms = np.sqrt(self._energy / self._samples)
+                self._energy[:] = 0
+                self._samples = 0
+        return self._last_rms
+
+
+def make_band_engine(engine, band_edges, sample_rate, chunk_size, order=4, max_window=None):
+    if engine == 'iir':
+        return IIRBandEngine(band_edges, sample_rate, order=order)
+    if engine == 'stream':
+        return StreamingBandEngine(band_edges, sample_rate, order=order)
+    return FFTBandEngine(band_edges, sample_rate, chunk_size, max_window=max_window)
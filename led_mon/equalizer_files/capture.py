@@ -0,0 +1,86 @@
+# Built-in Dependencies
+import threading
+import logging
+
+# Internal Dependencies
+from led_mon.equalizer_files.ring_buffer import AudioRingBuffer
+
+# External Dependencies
+import sounddevice as sd
+
+log = logging.getLogger(__name__)
+
+_captures = {}
+_captures_lock = threading.Lock()
+
+
+class AudioCapture:
+    """A single input stream shared by every equalizer that reads the same device.
+
+    Each block is written once into a shared ring buffer, then handed to the
+    registered consumers (e.g. streaming band engines), which pick their own
+    channel. Both panels therefore read sample-aligned audio from one stream.
+    """
+
+    def __init__(self, device, channels, sample_rate, block_size, ring_capacity):
+        self.key = (device, channels)
+        self.device = device
+        self.channels = channels
+        self.ring = AudioRingBuffer(ring_capacity, channels)
+        self.ref_count = 0
+        # Replaced, never mutated, so the audio thread can iterate it without a lock
+        self._consumers = ()
+        self.stream = sd.InputStream(
+            samplerate=sample_rate,
+            channels=channels,
+            blocksize=block_size,
+            callback=self._callback,
+            device=device
+        )
+
+    def _callback(self, indata, frames, time_info, status):
+        if status:
+            log.debug(f"Audio capture status ({self.device}): {status}")
+        self.ring.write(indata)
+        for consumer in self._consumers:
+            consumer(indata, frames, time_info, status)
+
+    def add_consumer(self, consumer):
+        with _captures_lock:
+            self._consumers = self._consumers + (consumer,)
+
+    def remove_consumer(self, consumer):
+        with _captures_lock:
+            self._consumers = tuple(c for c in self._consumers if c != consumer)
+
+
+def acquire_capture(device, channels, sample_rate, block_size, ring_capacity, consumer=None):
+    """Return the running capture for (device, channels), opening and starting it if needed."""
+    with _captures_lock:
+        capture = _captures.get((device, channels))
+        if capture is None:
+            capture = AudioCapture(device, channels, sample_rate, block_size, ring_capacity)
+            capture.stream.start()
+            _captures[capture.key] = capture
+            log.debug(f"Opened shared audio capture on '{device}' with {channels} channel(s)")
+        capture.ref_count += 1
+    if consumer is not None:
+        capture.add_consumer(consumer)
+    return capture
+
+def release_capture(capture, consumer=None):
+    """Drop one reference to capture; the stream is closed when the last user releases it."""
+    if consumer is not None:
+        capture.remove_consumer(consumer)
+    with _captures_lock:
+        capture.ref_count -= 1
+        if capture.ref_count > 0:
+            return
+        if _captures.get(capture.key) is capture:
+            del _captures[capture.key]
+    try:
+        capture.stream.stop()
+        capture.stream.close()
+    except Exception as e:
+        log.warning(f"Error closing audio capture on '{capture.device}': {e}")
+    log.debug(f"Closed shared audio capture on '{capture.device}'")
@@ -0,0 +1,57 @@
+# External Dependencies
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class AudioRingBuffer:
+    """Preallocated single-writer ring buffer for multi-channel audio blocks.
+
+    The storage holds every sample twice, at position i and i + capacity, so any
+    window of up to capacity samples ending at the newest sample is one contiguous
+    slice. Readers therefore get numpy views, never copies.
+
+    write() only copies into the preallocated storage and then publishes the new
+    sample count, so it is safe to call from the PortAudio callback without a lock.
+    A reader's view stays valid until the writer wraps around onto it: keep reads
+    to at most capacity minus one block of samples.
+    """
+
+    def __init__(self, capacity, channels, dtype=np.float32):
+        self.capacity = capacity
+        self.channels = channels
+        self._data = np.zeros((2 * capacity, channels), dtype=dtype)
+        # Total samples written so far; only ever advanced by the writer, after the data is in place
+        self.samples_written = 0
+
+    def write(self, block):
+        n = len(block)
+        if n > self.capacity:
+            block = block[-self.capacity:]
+        count = len(block)
+        start = (self.samples_written + n - count) % self.capacity
+        first = min(count, self.capacity - start)
+        # Low copy and mirrored high copy; the remainder wraps to the start of both
+        self._data[start:start+first] = block[:first]
+        self._data[start+self.capacity:start+self.capacity+first] = block[:first]
+        if first < count:
+            rest = count - first
+            self._data[:rest] = block[first:]
+            self._data[self.capacity:self.capacity+rest] = block[first:]
+        self.samples_written += n
+
+    def latest(self, n, channel=None):
+        """Return a view of the newest n samples, shape (n, channels), or (n,) for one channel."""
+        if n > self.capacity:
+            raise ValueError(f"Cannot read {n} samples from a ring buffer of {self.capacity}")
+        end = self.samples_written % self.capacity + self.capacity
+        view = self._data[end-n:end]
+        return view if channel is None else view[:, channel]
+
+    def latest_windows(self, size, hop, count, channel=None):
+        """Return count overlapping windows of size samples, hop apart, ending at the newest sample.
+
+        The result is a view of shape (count, size) for one channel, or
+        (count, channels, size) otherwise, oldest window first.
+        """
+        span = self.latest(size + hop * (count - 1), channel)
+        return sliding_window_view(span, size, axis=0)[::hop]
@@ -1,31 +1,28 @@
 
 # Built-in Dependencies
-import subprocess
 import time
 import os
 import re
 import threading
-from threading import Timer
 import argparse
 import logging
-from enum import Enum
-import shutil
 import signal
 import sys
-from pathlib import Path
 from led_mon import shared_state
-from led_mon.drawing import DrawingThread
+from led_mon.drawing import acquire_panel, release_panel, draw_overlay, FrameRing, PRIORITY_EQUALIZER
 
 # Internal Dependencies
 from led_mon.shared_state import discover_led_devices
 from led_mon.patterns import id_patterns
-import queue
+from led_mon.equalizer_files.band_engines import (
+    ENGINES, BAND_LAYOUTS, centered_band_edges, log_band_edges, make_band_engine
+)
+from led_mon.equalizer_files.capture import acquire_capture, release_capture
 
 # External Dependencies
 import numpy as np
 import sounddevice as sd
-from scipy.signal import butter, sosfiltfilt
-from pulsectl import Pulse
+from pulsectl import Pulse, PulseLoopStop
 
 
 level = logging.WARNING
@@ -43,11 +40,9 @@ logging.basicConfig(
 
 log = logging.getLogger(__name__)
 
-class DeviceType(Enum):
-    SOURCE = 1
-    SINK = 2
-
-SOURCE_CHECK_INTERVAL_SEC = 1
+# Safety net for the sink watcher: re-check the default sink even without events
+SINK_WATCH_TIMEOUT_SEC = 30
+SINK_WATCH_RETRY_SEC = 5
 DEFAULT_ZERO_FRAME_NOTIFY_DELAY_SEC = 4.0
 DEFAULT_SILENT_PULSE_AFTER_SEC = 12.0
 DEFAULT_SILENT_PULSE_PERIOD_SEC = 3.8
@@ -57,27 +52,29 @@ DEFAULT_SILENT_PULSE_REVEAL_SEC = 5.0
 SAMPLE_RATE = 48000
 CHUNK_SIZE = 1024
 UPDATE_RATE = 0.03 # 33 fps
+# Captured audio kept for the render thread, in blocks of CHUNK_SIZE
+RING_BUFFER_CHUNKS = 16
+# Longest FFT the fft engine uses for the low bands (~170 ms); reads stay a block short of the ring's capacity
+MAX_FFT_WINDOW = 8192
 
 # 9 frequency bands (If you use an EasyEffects filter, match the centers as closely as possible)
 BAND_CENTERS = [31.5, 63, 125, 250, 500, 1000, 2000, 4000, 8000]  # Hz
 Q = 1.414
-INPUTMODULE_CONTROL_APP = shutil.which('inputmodule-control')
-# Backward-compatible alias
-MODUE_CONTROL_APP = INPUTMODULE_CONTROL_APP
-PACTL_APP = shutil.which('pactl')
-
-def has_inputmodule_control():
-    return bool(INPUTMODULE_CONTROL_APP and Path(INPUTMODULE_CONTROL_APP).is_file())
-
-# Pre-compute bandpass filters (used in python file mode)
-filters = []
-for fc in BAND_CENTERS:
-    low = fc / Q
-    high = fc * Q
-    sos = butter(4, [low, high], btype='band', fs=SAMPLE_RATE, output='sos')
-    filters.append(sos)
-
-# Scale RMS to 0–34 range for --eq
+# Band energy engine: windowed FFTs per frame (longer for the low bands), or the original IIR filter bank
+DEFAULT_ENGINE = 'fft'
+DEFAULT_BAND_LAYOUT = 'centers'
+
+def get_band_edges(band_layout=DEFAULT_BAND_LAYOUT, external_filter=False):
+    if band_layout == 'log':
+        return log_band_edges(len(BAND_CENTERS))
+    if external_filter:
+        # EasyEffects mode: audio already EQ'd, so use wide-ish windows to capture
+        # its output without double-filtering
+        return centered_band_edges(BAND_CENTERS, 0.75, 1.35)
+    # Python mode: our fixed narrow bandpass filters
+    return centered_band_edges(BAND_CENTERS, 1 / Q, Q)
+
+# Scale RMS to the 0–34 bar height range
 def scale_rms(rms, min_db=-60, max_db=0):
     db = 20 * np.log10(rms + 1e-10)
     normalized = np.clip((db - min_db) / (max_db - min_db), 0, 1)
@@ -126,18 +123,11 @@ def resolve_input_stream_device(input_mode, input_device_hint=None):
     return 'default'
 
 
-# Lock for writing to LED matrix device
-device_lock = threading.Lock()
-_device_write_locks = {}
-_device_write_locks_guard = threading.Lock()
-
-def get_device_write_lock(device_name):
-    with _device_write_locks_guard:
-        lock = _device_write_locks.get(device_name)
-        if lock is None:
-            lock = threading.Lock()
-            _device_write_locks[device_name] = lock
-        return lock
+# Source-change cue: the pattern wipes down the panel CUE_REPEATS times, then the panel goes back to what it was showing
+CUE_REPEATS = 3
+CUE_WIPE_FRAMES = 6
+CUE_HOLD_FRAMES = 3
+CUE_FRAME_TIME = 0.04
 
 def get_notification_pattern(source):
     if re.match(".*headphone.*|.*Audio_Expansion.*", source):
@@ -153,140 +143,177 @@ def get_notification_pattern(source):
         # Other
         return 'gradient'
     
+# Same patterns as `inputmodule-control led-matrix --pattern <name>`
+def render_notification_pattern(pattern, fill_value):
+    grid = np.zeros((9, 34), dtype=int)
+    if pattern == 'all-on':
+        grid[:, :] = fill_value
+    elif pattern == 'zigzag':
+        # Diagonal bouncing between the left and right edge, every 8 rows
+        rows = np.arange(34)
+        cols = np.abs((rows + 8) % 16 - 8)
+        grid[cols, rows] = fill_value
+    else:
+        # Brightness ramps up from top to bottom
+        grid[:, :] = np.linspace(1, fill_value, 34).round().astype(int)
+    return grid
+
+def render_source_change_cue(pattern, fill_value):
+    full = render_notification_pattern(pattern, fill_value)
+    frames = []
+    for _ in range(CUE_REPEATS):
+        for step in range(1, CUE_WIPE_FRAMES + 1):
+            frame = np.zeros_like(full)
+            rows = 34 * step // CUE_WIPE_FRAMES
+            frame[:, :rows] = full[:, :rows]
+            frames.append(frame)
+        frames.extend([full] * CUE_HOLD_FRAMES)
+    return frames
+
 def draw_source_change_cue(source):
-    if not has_inputmodule_control():
+    if shared_state.id_key_press_active:
         return
     pattern = get_notification_pattern(source)
-    devices= discover_led_devices()
-    # Only one instance will usually detect the source change, so it notifies both devices
-    cmd_1 = [
-            INPUTMODULE_CONTROL_APP,
-            '--serial-dev', devices[0][1],
-            'led-matrix',
-            '--pattern',
-            pattern
-    ]
-    if len(devices) > 1:
-        cmd_2 = [
-                INPUTMODULE_CONTROL_APP,
-                '--serial-dev', devices[1][1],
-                'led-matrix',
-                '--pattern',
-                pattern
-        ]
-    else:
-        cmd_2 = None
-    with device_lock:
-        if not shared_state.id_key_press_active:
-            for _ in range(3):
-                subprocess.call(cmd_1, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                if cmd_2:
-                    subprocess.call(cmd_2, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                    
-def get_default_device(dev_type: DeviceType):
-    with Pulse() as pulse_tmp:  # Temporary connection to query
-        server_info = pulse_tmp.server_info()
-        new_dev = \
-            server_info.default_source_name if dev_type == DeviceType.SOURCE \
-            else server_info.default_sink_name if dev_type == DeviceType.SINK \
-            else None
-        return new_dev
-    
+    fill_value = max(1, int(shared_state.foreground_value))
+    # Only one instance will usually detect the source change, so it notifies every panel.
+    # The cue goes through each panel's DrawingThread ahead of its regular frames.
+    draw_overlay(render_source_change_cue(pattern, fill_value), CUE_FRAME_TIME)
+
+# Pipewire is supposed to automatically make the default source track the default sink's monitor, but the
+# capability is fragile and can sometimes be permanently broken. So we track sink changes and set the default
+# source to its monitor, to ensure continued data flow. We also draw a visual cue identifying the new source.
+class MonitorSourceWatcher(threading.Thread):
+    """Keeps the default source on the default sink's monitor, from one persistent pulsectl connection.
+
+    The thread subscribes to server and sink events and only queries the server
+    when one arrives, so sink switches are picked up as soon as they happen.
+    """
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.done = False
+        self.ref_count = 0
+        self.last_known_sink = None
+        self._pulse = None
+        self._changed = False
+
+    def stop(self):
+        self.done = True
+        pulse = self._pulse
+        if pulse is not None:
+            try:
+                pulse.event_listen_stop()
+            except Exception as e:
+                log.debug(f"Error stopping sink watcher: {e}")
+
+    def _on_event(self, event):
+        if event.facility == 'server' or event.t in ('new', 'remove'):
+            self._changed = True
+            raise PulseLoopStop
+
+    def sync(self, pulse):
+        server_info = pulse.server_info()
+        current_sink = server_info.default_sink_name
+        if current_sink == self.last_known_sink or current_sink is None:
+            return
+
+        expected_source = f"{current_sink}.monitor"
+        current_source = server_info.default_source_name
+
+        if current_source != expected_source and current_source is not None:
+            log.info(f"New sink detected: {current_sink}")
+            pulse.source_default_set(expected_source)
+            verified = pulse.server_info().default_source_name
+            if verified == expected_source:
+                log.info(f"Default source changed: {current_source} → {expected_source}")
+                draw_source_change_cue(expected_source)
+            else:
+                log.warning(f"Failed to change default source: still {verified}")
+
+        self.last_known_sink = current_sink
+
+    def run(self):
+        while not self.done:
+            try:
+                with Pulse('led-matrix-sink-watch') as pulse:
+                    self._pulse = pulse
+                    pulse.event_mask_set('server', 'sink')
+                    pulse.event_callback_set(self._on_event)
+                    self._changed = True
+                    while not self.done:
+                        if self._changed:
+                            self._changed = False
+                            self.sync(pulse)
+                        pulse.event_listen(timeout=SINK_WATCH_TIMEOUT_SEC)
+                        if not self._changed:
+                            # Timed out without events; re-check anyway
+                            self._changed = True
+            except Exception as e:
+                log.error(f"Sink watcher error, reconnecting in {SINK_WATCH_RETRY_SEC}s: {e}")
+                time.sleep(SINK_WATCH_RETRY_SEC)
+            finally:
+                self._pulse = None
+        log.debug("Sink watcher exited")
+
+_monitor_source_watcher = None
+_monitor_source_watcher_lock = threading.Lock()
+
+def acquire_monitor_source_watcher():
+    """Start the process-wide sink watcher if needed, and take a reference to it."""
+    global _monitor_source_watcher
+    with _monitor_source_watcher_lock:
+        if _monitor_source_watcher is None:
+            _monitor_source_watcher = MonitorSourceWatcher()
+            _monitor_source_watcher.start()
+        _monitor_source_watcher.ref_count += 1
+        return _monitor_source_watcher
+
+def release_monitor_source_watcher(watcher):
+    global _monitor_source_watcher
+    with _monitor_source_watcher_lock:
+        watcher.ref_count -= 1
+        if watcher.ref_count > 0:
+            return
+        watcher.stop()
+        if _monitor_source_watcher is watcher:
+            _monitor_source_watcher = None
+
 class Equalizer():
     
     def __init__(self, device_location):
         self.done = False
         self.device_name = None
-        self.last_known_sink = None
-        self.audio_buffer = np.zeros((CHUNK_SIZE, 2), dtype=np.float32)
-        self.buffer_lock = threading.Lock()
-        self.queue = queue.Queue(2)
-        self.drawing_thread = DrawingThread(device_location, self.queue)
-        self.drawing_thread.start()
+        self.audio_ring = None
+        self.channel = 0
+        self.band_engine = None
+        # Shared with the main loop and anything else drawing to this panel; our frames take priority over the apps'
+        self.panel = acquire_panel(device_location)
+        # A previous equalizer on this panel may have released our priority
+        self.panel.input_queue.claim(PRIORITY_EQUALIZER)
+        self.frames = FrameRing()
+        self.frames_queued = 0
         
     def stop(self):
         if not self.done:
             self.done = True
-            try:
-                self.queue.put_nowait(None)  # Sentinel to stop DrawingThread
-            except queue.Full:
-                try:
-                    self.queue.get_nowait()
-                except queue.Empty:
-                    pass
-                try:
-                    self.queue.put_nowait(None)
-                except queue.Full:
-                    pass
+            release_panel(self.panel, priority=PRIORITY_EQUALIZER)
         device_name = self.device_name if self.device_name else "<unknown>"
         log.debug(f"Stop equalizer on device {device_name}")
 
-    def queue_frame(self, grid, animate=False):
-        frame = (grid, animate)
-        try:
-            self.queue.put_nowait(frame)
-        except queue.Full:
-            try:
-                self.queue.get_nowait()
-            except queue.Empty:
-                pass
-            try:
-                self.queue.put_nowait(frame)
-            except queue.Full:
-                pass
-    
-    # Pipewire is supposed to automatically make the default source track the default sink's monitor, but the
-    # capability is fragile and can sometimes be permanently broken. So we track sink changes and set the default
-    # source to its monitor, to ensure continued data flow. We also draw a visual cue identifying the new source.
-    def force_monitor_source(self):
-        if not PACTL_APP:
-            if not hasattr(self, '_pactl_missing_logged'):
-                self._pactl_missing_logged = True
-                log.warning("pactl was not found on PATH; skipping monitor-source auto-sync for equalizer.")
-            return
-        try:
-            current_sink = get_default_device(DeviceType.SINK)
-            if current_sink == self.last_known_sink or current_sink is None:
-                if not self.done:
-                    Timer(SOURCE_CHECK_INTERVAL_SEC, self.force_monitor_source).start()
-                return
-
-            expected_source = f"{current_sink}.monitor"
-            current_source = get_default_device(DeviceType.SOURCE)
-
-            if current_source != expected_source and current_source is not None:
-                log.info(f"New sink detected: {current_sink}")
-                subprocess.run(
-                    [PACTL_APP, 'set-default-source', expected_source],
-                    check=True,
-                    capture_output=True,
-                    text=True
-                )
-                #time.sleep(0.2)  # tiny settle time, may not be needed
-                verified = get_default_device(DeviceType.SOURCE)
-                if verified == expected_source:
-                    log.info(f"Default source changed: {current_source} → {expected_source}")
-                    draw_source_change_cue(expected_source)
-                else:
-                    log.warning(f"Failed to change default source: still {verified}")
-                    
-            self.last_known_sink = current_sink
-
-        except subprocess.CalledProcessError as e:
-            log.error(f"Failed to check/fix default source: {e}")
-        except Exception as e:
-            log.error(f"Unexpected error in force_monitor_source: {e}")
+    def queue_frame(self, grid):
         if not self.done:
-            Timer(SOURCE_CHECK_INTERVAL_SEC, self.force_monitor_source).start()
-        
+            # Only the first frame turns animation off; the mailbox restores that whenever the panel comes back to us
+            animate = None if self.frames_queued else False
+            self.panel.input_queue.put((grid, animate), priority=PRIORITY_EQUALIZER)
+            self.frames_queued += 1
+    
     def cleanup(self, sig=None, frame=None):
         self.stop()
 
     def audio_callback(self, indata, frames, time_info, status):
-        if status:
-            log.debug(f"Audio callback status ({self.device_name or 'unknown'}): {status}")
-        with self.buffer_lock:
-            self.audio_buffer = indata.copy()
+        # Runs on the PortAudio thread, after the shared capture has stored the block in its ring buffer
+        band_engine = self.band_engine
+        if band_engine is not None and band_engine.streaming:
+            band_engine.feed(indata[:, min(self.channel, indata.shape[1] - 1)])
         
     def draw_inverted_silence_pulse(self, elapsed_sec, pulse_period_sec, reveal_sec):
         pulse_period_sec = clamp_positive_float(pulse_period_sec, DEFAULT_SILENT_PULSE_PERIOD_SEC)
@@ -321,7 +348,21 @@ class Equalizer():
         reveal = np.clip(elapsed_sec / reveal_sec, 0.0, 1.0)
         paused_mask = (id_patterns['equalizer_paused'] > 0).astype(float)
         grid = np.rint(grid * (1.0 - (paused_mask * reveal))).astype(int)
-        self.queue_frame(grid, False)
+        self.queue_frame(grid)
+
+    def draw_levels(self, levels):
+        """Draw the band levels as vertical bars centered on the panel, like `inputmodule-control --eq`."""
+        fill_value = max(1, int(shared_state.foreground_value))
+        levels = np.asarray(levels, dtype=int)[:, None]
+        above = levels // 2
+        below = levels - above
+        rows = np.arange(34)[None, :]
+        center = 34 // 2
+        lit = (rows >= center - below) & (rows < center + above)
+        grid = self.frames.frame()
+        np.multiply(lit, fill_value, out=grid)
+        self.queue_frame(grid)
+        self.frames.advance()
 
     def run(
         self,
@@ -337,17 +378,32 @@ class Equalizer():
         silent_pulse_after_sec=DEFAULT_SILENT_PULSE_AFTER_SEC,
         silent_pulse_period_sec=DEFAULT_SILENT_PULSE_PERIOD_SEC,
         silent_pulse_reveal_sec=DEFAULT_SILENT_PULSE_REVEAL_SEC,
+        engine=DEFAULT_ENGINE,
+        band_layout=DEFAULT_BAND_LAYOUT,
     ):
         self.device_name = device_name
-        if not has_inputmodule_control():
-            log.error("The executable file inputmodule-control was not found on the executable Path. The equalizer will not run.")
-            self.stop()
-            return False
 
         input_mode = str(input_mode or 'playback').strip().lower()
         if input_mode not in ('playback', 'microphone'):
             log.warning(f"Unknown equalizer input mode '{input_mode}', defaulting to playback.")
             input_mode = 'playback'
+        if engine not in ENGINES:
+            log.warning(f"Unknown equalizer engine '{engine}', defaulting to {DEFAULT_ENGINE}.")
+            engine = DEFAULT_ENGINE
+        if band_layout not in BAND_LAYOUTS:
+            log.warning(f"Unknown equalizer band layout '{band_layout}', defaulting to {DEFAULT_BAND_LAYOUT}.")
+            band_layout = DEFAULT_BAND_LAYOUT
+        band_engine = make_band_engine(
+            engine,
+            get_band_edges(band_layout, external_filter),
+            SAMPLE_RATE,
+            CHUNK_SIZE,
+            order=2 if external_filter else 4,
+            max_window=MAX_FFT_WINDOW,
+        )
+        self.channel = channel
+        self.band_engine = band_engine
+        window_size = getattr(band_engine, 'window_size', CHUNK_SIZE)
 
         zero_frame_notify_delay_sec = max(
             0.0,
@@ -367,10 +423,6 @@ class Equalizer():
             activity_resume_threshold = max(26, silence_level_sum_threshold + 12)
             activity_resume_hold_sec = 0.30
 
-        if input_mode == 'playback':
-            self.force_monitor_source()
-        device_write_lock = get_device_write_lock(device_name)
-
         stream_device = resolve_input_stream_device(input_mode, input_device)
         stream_channels = 2
         try:
@@ -384,27 +436,32 @@ class Equalizer():
             log.warning(f"Could not query input channels for '{stream_device}', falling back to mono: {e}")
             stream_channels = 1
 
-        def make_stream(selected_device, channels):
-            return sd.InputStream(
-                samplerate=SAMPLE_RATE,
-                channels=channels,
-                blocksize=CHUNK_SIZE,
-                callback=self.audio_callback,
-                device=selected_device
+        def open_capture(selected_device, channels):
+            # Equalizers on both panels reading the same device share one input stream
+            return acquire_capture(
+                selected_device,
+                channels,
+                SAMPLE_RATE,
+                CHUNK_SIZE,
+                RING_BUFFER_CHUNKS * CHUNK_SIZE,
+                consumer=self.audio_callback,
             )
 
         try:
-            stream = make_stream(stream_device, stream_channels)
+            capture = open_capture(stream_device, stream_channels)
         except Exception as e:
             if stream_device != 'default':
                 log.warning(f"Unable to open input device '{stream_device}', retrying with default input: {e}")
                 stream_device = 'default'
                 stream_channels = 2 if input_mode == 'playback' else 1
-                stream = make_stream(stream_device, stream_channels)
+                capture = open_capture(stream_device, stream_channels)
             else:
                 log.error(f"Unable to open equalizer input stream: {e}")
                 self.stop()
                 return False
+        self.audio_ring = capture.ring
+        # Taken once the capture is open, so every path that holds it reaches the release below
+        monitor_source_watcher = acquire_monitor_source_watcher() if input_mode == 'playback' else None
 
         last_nonzero_frame_ts = time.monotonic()
         pulse_phase_anchor_ts = last_nonzero_frame_ts
@@ -428,44 +485,19 @@ class Equalizer():
                 )
 
             while not self.done:
-                with self.buffer_lock:
-                    buffer_snapshot = self.audio_buffer.copy()
-                if buffer_snapshot.ndim == 1:
-                    chunk = buffer_snapshot
+                if band_engine.streaming:
+                    # Energies accumulated by audio_callback since the previous frame
+                    band_rms = band_engine.band_rms()
                 else:
-                    selected_channel = min(channel, max(0, buffer_snapshot.shape[1] - 1))
-                    chunk = buffer_snapshot[:, selected_channel]
-
-                levels = []
-
-                if external_filter:
-                    # EasyEffects mode: audio already EQ'd → measure energy in each band
-                    for center_freq in BAND_CENTERS:
-                        # Use wide-ish windows to capture EasyEffects' output without double-filtering
-                        low = center_freq * 0.75
-                        high = center_freq * 1.35
-                        sos = butter(2, [low, high], btype='band', fs=SAMPLE_RATE, output='sos')
-                        filtered = sosfiltfilt(sos, chunk)
-                        rms = np.sqrt(np.mean(filtered ** 2))
-                        level = scale_rms(rms)
-                        levels.append(level)
+                    # Zero-copy view of the newest audio of the selected channel, as much as the engine's longest window
+                    audio_ring = self.audio_ring
+                    chunk = audio_ring.latest(window_size, channel=min(channel, audio_ring.channels - 1))
+                    band_rms = band_engine.band_rms(chunk)
 
-                else:
-                    # Python mode: apply our fixed narrow bandpass filters
-                    for sos in filters:
-                        filtered = sosfiltfilt(sos, chunk)
-                        rms = np.sqrt(np.mean(filtered ** 2))
-                        level = scale_rms(rms)
-                        levels.append(level)
+                levels = [scale_rms(rms) for rms in band_rms]
                 boosted_levels = [min(34, int(round(level * level_gain))) for level in levels]
                 levels = [0 if level < noise_gate_level else level for level in boosted_levels]
 
-                cmd = [
-                    INPUTMODULE_CONTROL_APP,
-                    '--serial-dev', device_name,
-                    'led-matrix',
-                    '--eq',
-                ] + [str(l) for l in levels]
                 levels_sum = sum(levels)
                 now = time.monotonic()
                 if not shared_state.id_key_press_active:
@@ -479,8 +511,7 @@ class Equalizer():
                                     idle_mode = None
                                     idle_mode_started_ts = None
                                     active_candidate_started_ts = None
-                                    with device_write_lock:
-                                        subprocess.call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                                    self.draw_levels(levels)
                                 else:
                                     render_silent_pulse(now)
                             else:
@@ -491,8 +522,7 @@ class Equalizer():
                             last_nonzero_frame_ts = now
                             idle_mode = None
                             idle_mode_started_ts = None
-                            with device_write_lock:
-                                subprocess.call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                            self.draw_levels(levels)
                     else:
                         active_candidate_started_ts = None
                         silence_sec = now - last_nonzero_frame_ts
@@ -502,19 +532,24 @@ class Equalizer():
                 time.sleep(UPDATE_RATE)
 
         update_thread = threading.Thread(target=update_leds, daemon=True)
-        update_thread.start()
 
-        with stream:
-            log.debug(
-                f"Running equalizer for {channel} channel on {device_name} "
-                f"using {input_mode} input via '{stream_device}' "
-                f"with {'EasyEffects' if external_filter else 'Python'} filter"
-            )
-            try:
-                while not self.done:
-                    time.sleep(0.1)
-            except KeyboardInterrupt:
-                self.cleanup()
+        log.debug(
+            f"Running equalizer for {channel} channel on {device_name} "
+            f"using {input_mode} input via '{stream_device}' "
+            f"with {'EasyEffects' if external_filter else 'Python'} filter "
+            f"({engine} engine, {band_layout} bands)"
+        )
+        try:
+            update_thread.start()
+            while not self.done:
+                time.sleep(0.1)
+        except KeyboardInterrupt:
+            self.cleanup()
+        finally:
+            # The capture keeps running while the other panel's equalizer still uses it
+            release_capture(capture, consumer=self.audio_callback)
+            if monitor_source_watcher is not None:
+                release_monitor_source_watcher(monitor_source_watcher)
         return True
             
 if __name__ == '__main__':
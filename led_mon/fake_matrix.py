@@ -0,0 +1,224 @@
+# Emulates LED Matrix Input Modules on pseudo-terminals, so the service can run and be measured without hardware.
+#
+#   python -m led_mon.fake_matrix [--panels 2] [--show]
+#
+# Prints the LED_MATRIX_DEVICES setting that points discovery at the fake panels, then their throughput every second.
+# Only the commands this project sends are implemented: Brightness, Pattern (ignored), Sleep, Animate, DrawBW,
+# StageCol and FlushCols. See https://github.com/FrameworkComputer/inputmodule-rs/blob/main/commands.md
+
+# Built In Dependencies
+import os
+import tty
+import time
+import select
+import threading
+import logging
+from argparse import ArgumentParser
+from collections import Counter
+
+# Internal Dependencies
+from led_mon.commands import Commands
+from led_mon.shared_state import DEVICE_OVERRIDE_ENV
+
+# External Dependencies
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# Not imported from drawing.py, which loads every plugin on import
+MAGIC = (0x32, 0xAC)
+PANEL_WIDTH = 9
+PANEL_HEIGHT = 34
+# Parameter bytes that follow the magic and command id
+PARAM_LENGTHS = {
+    Commands.Brightness: 1,
+    Commands.Pattern: 1,
+    Commands.Sleep: 1,
+    Commands.Animate: 1,
+    Commands.DrawBW: 39,
+    Commands.StageCol: 1 + PANEL_HEIGHT,
+    Commands.FlushCols: 0,
+}
+# The firmware scrolls the display by one row at this interval while animating
+ANIMATE_STEP_SEC = 0.05
+# The firmware pads every response to this many bytes
+RESPONSE_SIZE = 32
+
+
+class FakeLEDMatrix:
+    """One emulated panel behind a pty. Write to the device path as if it were the panel's tty.
+
+    The framebuffer holds the per-pixel values drawn by FlushCols or DrawBW; the
+    global brightness set by the Brightness command is kept separately, as on the
+    device. Columns staged with StageCol persist across flushes and are not
+    touched by DrawBW, like the firmware's.
+    """
+    def __init__(self, location='fake-1', brightness=255):
+        self.location = location
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        # Keeping our own handle on the slave end means the writer can close and reopen it freely
+        self.device = os.ttyname(self._slave)
+        self.framebuffer = np.zeros((PANEL_WIDTH, PANEL_HEIGHT), dtype=np.uint8)
+        self.staged = np.zeros((PANEL_WIDTH, PANEL_HEIGHT), dtype=np.uint8)
+        self.brightness = brightness
+        self.animate = False
+        self.sleeping = False
+        self.commands = Counter()
+        self.bytes_received = 0
+        self.frames = 0
+        self.bad_bytes = 0
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._done = False
+        self._started = time.monotonic()
+        self._last_scroll = self._started
+        self._thread = threading.Thread(target=self._run, name=f'fake-led-matrix-{location}', daemon=True)
+
+    def start(self):
+        self._started = time.monotonic()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._done = True
+        if self._thread.is_alive():
+            self._thread.join(1.0)
+        os.close(self._master)
+        os.close(self._slave)
+
+    def stats(self):
+        with self._lock:
+            elapsed = max(time.monotonic() - self._started, 1e-9)
+            return {
+                'location': self.location,
+                'device': self.device,
+                'elapsed_sec': elapsed,
+                'bytes': self.bytes_received,
+                'frames': self.frames,
+                'bytes_per_sec': self.bytes_received / elapsed,
+                'frames_per_sec': self.frames / elapsed,
+                'bad_bytes': self.bad_bytes,
+                'commands': {f"0x{cmd:02x}": n for cmd, n in sorted(self.commands.items())},
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.commands.clear()
+            self.bytes_received = self.frames = self.bad_bytes = 0
+            self._started = time.monotonic()
+
+    def snapshot(self):
+        """What the panel shows: per-pixel values scaled by the global brightness."""
+        with self._lock:
+            return (self.framebuffer.astype(np.uint16) * self.brightness // 255).astype(np.uint8)
+
+    def render_text(self):
+        shades = ' .:-=+*#%@'
+        grid = self.snapshot()
+        return '\n'.join(
+            ''.join(shades[int(v) * (len(shades) - 1) // 255] for v in grid[:, y])
+            for y in range(PANEL_HEIGHT)
+        )
+
+    def _run(self):
+        while not self._done:
+            ready, _, _ = select.select([self._master], [], [], ANIMATE_STEP_SEC)
+            if ready:
+                try:
+                    data = os.read(self._master, 4096)
+                except OSError:
+                    continue
+                with self._lock:
+                    self.bytes_received += len(data)
+                    self._buffer += data
+                    self._parse()
+            if self.animate:
+                now = time.monotonic()
+                if now - self._last_scroll >= ANIMATE_STEP_SEC:
+                    self._last_scroll = now
+                    with self._lock:
+                        self.framebuffer = np.roll(self.framebuffer, 1, axis=1)
+
+    def _parse(self):
+        buffer = self._buffer
+        while len(buffer) >= 3:
+            if buffer[0] != MAGIC[0] or buffer[1] != MAGIC[1]:
+                # Out of sync: drop everything up to the next magic
+                start = buffer.find(bytes(MAGIC))
+                dropped = start if start >= 0 else len(buffer) - 1
+                self.bad_bytes += dropped
+                del buffer[:dropped]
+                continue
+            command = buffer[2]
+            if command == Commands.Brightness and len(buffer) == 3:
+                # A Brightness command on its own is a query. The firmware tells it from a set by the
+                # USB packet length; here a query is whatever arrives with nothing after it
+                self.commands[command] += 1
+                os.write(self._master, bytes([self.brightness]).ljust(RESPONSE_SIZE, b'\x00'))
+                del buffer[:3]
+                continue
+            length = PARAM_LENGTHS.get(command)
+            if length is None:
+                log.debug(f"Fake LED matrix {self.location}: unsupported command 0x{command:02x}")
+                self.bad_bytes += 3
+                del buffer[:3]
+                continue
+            if len(buffer) < 3 + length:
+                return
+            self._execute(command, bytes(buffer[3:3+length]))
+            del buffer[:3+length]
+
+    def _execute(self, command, params):
+        self.commands[command] += 1
+        if command == Commands.Brightness:
+            self.brightness = params[0]
+        elif command == Commands.Sleep:
+            self.sleeping = bool(params[0])
+        elif command == Commands.Animate:
+            self.animate = bool(params[0])
+        elif command == Commands.StageCol:
+            col = params[0]
+            if col < PANEL_WIDTH:
+                self.staged[col] = np.frombuffer(params, dtype=np.uint8, offset=1)
+        elif command == Commands.FlushCols:
+            self.framebuffer = self.staged.copy()
+            self.frames += 1
+        elif command == Commands.DrawBW:
+            bits = np.unpackbits(np.frombuffer(params, dtype=np.uint8), bitorder='little')
+            pixels = bits[:PANEL_WIDTH * PANEL_HEIGHT].reshape(PANEL_HEIGHT, PANEL_WIDTH).T
+            self.framebuffer = pixels * np.uint8(0xFF)
+            self.frames += 1
+
+
+def start_fake_panels(count=2):
+    panels = [FakeLEDMatrix(f'fake-{i+1}').start() for i in range(count)]
+    return panels
+
+def device_override(panels):
+    """The LED_MATRIX_DEVICES value that points discovery at the given fake panels."""
+    return ','.join(f"{p.location}={p.device}" for p in panels)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Emulate LED Matrix Input Modules on pseudo-terminals")
+    parser.add_argument('--panels', type=int, default=2, choices=[1, 2], help="Number of panels to emulate")
+    parser.add_argument('--show', action='store_true', help="Print the panel contents every second")
+    args = parser.parse_args()
+
+    panels = start_fake_panels(args.panels)
+    print(f"export {DEVICE_OVERRIDE_ENV}={device_override(panels)}", flush=True)
+    try:
+        while True:
+            time.sleep(1)
+            for p in panels:
+                s = p.stats()
+                print(f"{p.location}: {s['bytes_per_sec']:8.0f} B/s {s['frames_per_sec']:6.1f} frames/s "
+                      f"brightness={p.brightness} animate={p.animate} sleep={p.sleeping}", flush=True)
+                p.reset_stats()
+            if args.show:
+                rows = zip(*(p.render_text().split('\n') for p in panels))
+                print('\n'.join('   '.join(r) for r in rows), flush=True)
+    except KeyboardInterrupt:
+        for p in panels:
+            p.stop()
@@ -1,7 +1,6 @@
 # Built In Dependencies
 from threading import Thread
 import time
-import queue
 import sys
 import re
 from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
@@ -12,13 +11,14 @@ from collections import defaultdict
 import logging
 
 # Internal Dependencies
-from led_mon.drawing import draw_outline_border, draw_ids, draw_id, draw_app, draw_app_border, DrawingThread
-from led_mon.monitors import CPUMonitor, MemoryMonitor, BatteryMonitor, DiskMonitor, NetworkMonitor, get_monitor_brightness
-from led_mon import shared_state
+from led_mon.drawing import draw_outline_border, draw_ids, draw_id, draw_app, draw_app_border, acquire_panel, PRIORITY_ID, FrameRing
+from led_mon.monitors import CPUMonitor, MemoryMonitor, BatteryMonitor, DiskMonitor, NetworkMonitor, get_monitor_brightness, PEAK_HALF_LIFE_SEC, \
+    DISK_FULL_SCALE_FLOOR, NET_FULL_SCALE_FLOOR
+from led_mon.sampler import get_sampler
+from led_mon import shared_state, drawing
 from led_mon.shared_state import discover_led_devices
 
 # External Dependencies
-import numpy as np
 import evdev
 from evdev import ecodes
 from yaml import safe_load
@@ -152,6 +152,14 @@ def list_apps(base_apps, plugin_apps, quads):
         
 device = None
 def app(args, base_apps, plugin_apps):    
+    # Headless benchmark: emulated panels, canned monitor data, no key listener
+    bench = None
+    if args.bench:
+        from led_mon.bench import Bench
+        args.no_key_listener = True
+        bench = Bench(args.bench, data_file=args.bench_data, record_file=args.bench_record,
+                      json_file=args.bench_json, frame_interval=args.bench_interval)
+
     # Initialize evdev device for key listening if not disabled
     global device
     if not args.no_key_listener:
@@ -226,23 +234,41 @@ def app(args, base_apps, plugin_apps):
     cpu_monitor = CPUMonitor()
     memory_monitor = MemoryMonitor()
     battery_monitor = BatteryMonitor()
-    disk_monitor = DiskMonitor()
-    network_monitor = NetworkMonitor()
-
-    # Setup left panel drawing queue
-    left_drawing_queue = queue.Queue(2)
-    left_drawing_thread = DrawingThread(locations[0], left_drawing_queue)
-    left_drawing_thread.set_animate(False)
-    left_drawing_thread.start()    
+    peak_half_life = config.get('peak-half-life', PEAK_HALF_LIFE_SEC)
+    # Bytes/s that the disk and network bars show as full even when the recent peak is lower
+    disk_monitor = DiskMonitor(peak_half_life=peak_half_life,
+                               full_scale_floor=config.get('disk-full-scale-floor', DISK_FULL_SCALE_FLOOR))
+    network_monitor = NetworkMonitor(peak_half_life=peak_half_life,
+                                     full_scale_floor=config.get('net-full-scale-floor', NET_FULL_SCALE_FLOOR))
+    if bench:
+        cpu_monitor, memory_monitor, battery_monitor, disk_monitor, network_monitor = \
+            bench.monitors(cpu_monitor, memory_monitor, battery_monitor, disk_monitor, network_monitor)
+        read_brightness = bench.brightness
+    else:
+        # Sample the monitors on a background thread; the apps only read the latest values
+        sampler = get_sampler()
+        cpu_monitor = sampler.add('cpu', cpu_monitor.get)
+        memory_monitor = sampler.add('memory', memory_monitor.get, interval=0.5)
+        battery_monitor = sampler.add('battery', battery_monitor.get, interval=2.0)
+        disk_monitor = sampler.add('disk', disk_monitor.get)
+        network_monitor = sampler.add('network', network_monitor.get)
+        read_brightness = sampler.add('brightness', get_monitor_brightness, interval=0.5).get
+        sampler.set_intervals(config.get('sample-intervals'))
+
+    # Setup left panel drawing queue. The panel's DrawingThread is shared with plugins that draw to it (e.g. equalizer)
+    left_drawing_thread = acquire_panel(locations[0])
+    left_drawing_queue = left_drawing_thread.input_queue
     drawing_queues.append(left_drawing_queue)
 
     # Setup right panel drawing queue (if panel is present)
     if len(locations) == 2:
-        right_drawing_queue = queue.Queue(2)
-        right_drawing_thread = DrawingThread(locations[1], right_drawing_queue)
-        right_drawing_thread.set_animate(False)
-        right_drawing_thread.start()
+        right_drawing_thread = acquire_panel(locations[1])
+        right_drawing_queue = right_drawing_thread.input_queue
         drawing_queues.append(right_drawing_queue)
+
+    # Preallocated frames for each panel, for the apps and for the ID display
+    app_frames = [FrameRing() for _ in drawing_queues]
+    id_frames = [FrameRing() for _ in drawing_queues]
     
     def draw_cpu(arg, grid, foreground_value, idx):
         last_cpu_values = cpu_monitor.get()
@@ -374,7 +400,7 @@ def app(args, base_apps, plugin_apps):
     #################################################
     ###      Load app functions from plugins      ###
     #################################################
-    if not re.search(r"--disable-plugins|-dp", str(sys.argv)):
+    if not drawing.plugins_disabled():
         # Try to find plugins directory - either in current dir or installed location
         import os.path
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -409,7 +435,7 @@ def app(args, base_apps, plugin_apps):
     def render_iteration(args):
         global latch_key_combo, next_key_fired, freeze_app_switching, evdev_next_key_pressed
         try:
-            screen_brightness = get_monitor_brightness()
+            screen_brightness = read_brightness()
             background_value = int(screen_brightness * (max_background_brightness - min_background_brightness) + min_background_brightness)
             foreground_value = int(screen_brightness * (max_foreground_brightness - min_foreground_brightness) + min_foreground_brightness)
             shared_state.foreground_value = foreground_value
@@ -418,8 +444,6 @@ def app(args, base_apps, plugin_apps):
             background_value = max(0, min(255, background_value))
             foreground_value = max(0, min(255, foreground_value))
 
-            grid = np.zeros((9,34), dtype = int)
-            
             # Check for key combo using both evdev (if available) and pynput
             active_keys = device.active_keys(verbose=True) if device else []
             evdev_id_key_pressed = True if (MODIFIER_KEYS[0] in active_keys or MODIFIER_KEYS[1] in active_keys) and KEY_I in active_keys and device else False
@@ -524,12 +548,15 @@ def app(args, base_apps, plugin_apps):
                 if quadrant not in currently_suppressed_quadrants:
                     suppressed_panel_apps[quadrant] = None
 
-            # Capture animating state so we can restart it if necessary after stopping it for ID display
-            animating_left = any(arg.get("animate", False) for arg in left_args)
-            animating_right = any(arg.get("animate", False) for arg in right_args)
-            
             if id_key_combo_active:
+                # Animation only needs turning off with the first ID frame; later ones leave it alone
+                id_animate = None if latch_key_combo else False
+                if not latch_key_combo:
+                    # The previous ID session released the priority, which drops frames until it is claimed
+                    for draw_queue in drawing_queues:
+                        draw_queue.claim(PRIORITY_ID)
                 # Show app IDs for each quadrant or panel
+                grid = id_frames[0].frame()
                 draw_outline_border(grid, background_value)
                 # If app takes up entire panel, draw the panel app ID only
                 if left_owner_app:
@@ -537,23 +564,30 @@ def app(args, base_apps, plugin_apps):
                 else:
                     draw_ids(grid, left_args[0]['name'], left_args[1]['name'], foreground_value,
                         targs=left_args[0].get('args', None), bargs=left_args[1].get('args', None))
-                left_drawing_queue.put((grid, False))
+                left_drawing_queue.put((grid, id_animate), priority=PRIORITY_ID)
+                id_frames[0].advance()
                 
                 if len(drawing_queues) > 1:  # Right panel exists
-                    grid = np.zeros((9,34), dtype = int)
+                    grid = id_frames[1].frame()
                     draw_outline_border(grid, background_value)
                     if right_owner_app:
                         draw_id(grid, right_owner_app['name'], foreground_value, args=right_owner_app.get('args', None))
                     else:
                         draw_ids(grid, right_args[0]['name'], right_args[1]['name'], foreground_value,
                             targs=right_args[0].get('args', None), bargs=right_args[1].get('args', None))
-                    right_drawing_queue.put((grid, False))
+                    right_drawing_queue.put((grid, id_animate), priority=PRIORITY_ID)
+                    id_frames[1].advance()
                 time.sleep(0.1)
                 latch_key_combo = True
                 return
+            if latch_key_combo:
+                # Hand the panels back to whatever was drawing before (the transport restores its animation)
+                for draw_queue in drawing_queues:
+                    draw_queue.release(PRIORITY_ID)
+                latch_key_combo = False
             
             for i, draw_queue in enumerate(drawing_queues):
-                grid = np.zeros((9,34), dtype = int)
+                grid = app_frames[i].frame()
                 if i == 0:
                     panel = 'left'
                     _args = left_args
@@ -581,7 +615,10 @@ def app(args, base_apps, plugin_apps):
                         func = app_functions[arg_name]
                         func_args = [arg_name, grid, foreground_value, idx]
                         kwargs = build_app_kwargs(arg)
+                        app_start = time.perf_counter()
                         func(*func_args, **kwargs)
+                        if bench:
+                            bench.record_app(arg_name, time.perf_counter() - app_start)
                         animate = arg.get("animate", False)
                     except KeyError:
                         log.error(f"Unrecognized app {arg_name} for {loc} {panel}")
@@ -596,13 +633,9 @@ def app(args, base_apps, plugin_apps):
                     do_animate = animate
                     idx_changed[draw_queue] = False
                         
-                # Restart animation if it was stopped for ID display
-                if latch_key_combo:
-                    if (animating_left and panel == 'left') or (animating_right and panel == 'right'):
-                        do_animate = True
                 if not persistent_draw:
                     draw_queue.put((grid, do_animate))
-            latch_key_combo = False
+                    app_frames[i].advance()
             for app in apps_to_dispose:
                 dispose_fn = app.get('dispose-fn', None)
                 if dispose_fn:
@@ -610,13 +643,16 @@ def app(args, base_apps, plugin_apps):
                     kwargs = build_app_kwargs(app)
                     func(**kwargs)
             del apps_to_dispose
-            time.sleep(0.1)     
+            time.sleep(bench.frame_interval if bench else 0.1)
         except KeyboardInterrupt:
             raise
         except Exception as e:
             log.error(f"Error in main loop: {e}")
             time.sleep(1.0)
             
+    if bench:
+        bench.finish(bench.run(render_iteration, args))  # Exits the process
+
     # Informative message if pynput is not available
     if not PYNPUT_AVAILABLE and not args.no_key_listener:
         log.warning("Info: pynput is unavailable; running in evdev-only mode. Use Ctrl+C to exit.")
@@ -642,7 +678,7 @@ def main(args):
     plugin_apps = []
     ###############################################################
     ###  Load additional app names from plugins for listing insalled apps  ###
-    if not re.search(r"--disable-plugins|-dp", str(sys.argv)):
+    if not drawing.plugins_disabled():
         # Try to find plugins directory - either in current dir or installed location
         import os.path
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -670,8 +706,23 @@ def main(args):
     mode_group.add_argument("--disable-plugins", "-dp", action="store_true", help="Do not load any plugin code")
     mode_group.add_argument("--list-apps", "-la", action="store_true", help="List the installed apps, and exit")
     mode_group.add_argument("--config-file", "-cf", default=None, help="Absolute path to custom config file")
+    mode_group.add_argument("--transport", "-t", choices=drawing.TRANSPORTS, default=drawing.transport,
+        help="Panel transport: a thread per panel, or one asyncio event loop for all panels (env LED_MATRIX_TRANSPORT)")
+
+    bench_group = parser.add_argument_group("benchmark")
+    bench_group.add_argument("--bench", type=int, default=None, metavar="FRAMES",
+        help="Render FRAMES frames on emulated panels as fast as possible, print timings, and exit")
+    bench_group.add_argument("--bench-json", default=None, metavar="PATH",
+        help="Also write the benchmark results as JSON to PATH ('-' prints only JSON to stdout)")
+    bench_group.add_argument("--bench-data", default=None, metavar="PATH",
+        help="Replay monitor data recorded with --bench-record, instead of synthetic data")
+    bench_group.add_argument("--bench-record", default=None, metavar="PATH",
+        help="Use the live monitors, and record their data to PATH for later replay")
+    bench_group.add_argument("--bench-interval", type=float, default=0.0, metavar="SEC",
+        help="Sleep between benchmark frames (the service sleeps 0.1s)")
     
     args = parser.parse_args()
+    drawing.transport = args.transport
     app(args, base_apps, plugin_apps)
 
 if __name__ == "__main__":
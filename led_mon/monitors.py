@@ -1,9 +1,14 @@
 # Built In Dependencies
 import time
 import os
+import re
+import sys
+import logging
+from collections import namedtuple, deque
 
 # External Dependencies
 import psutil
+import numpy as np
 
 # Reference for fractional measure of sensor temps (in degrees Celcius)
 TEMP_REF = 120
@@ -14,6 +19,19 @@ MAX_FAN_SPEED = 6_000
 if os.name == 'nt':
     import wmi
 
+log = logging.getLogger(__name__)
+
+# Snapshots younger than this are shared, so that monitors sampled in the same tick read the counters once
+SNAPSHOT_MAX_AGE_SEC = 0.05
+# /proc/diskstats counts 512 byte sectors, whatever the device's sector size
+DISK_SECTOR_SIZE = 512
+# Seconds for the peak that disk and network rates are scaled against to fall by half, after a burst
+PEAK_HALF_LIFE_SEC = 120
+# Smallest full-scale rate in bytes/s for the disk and network bars, so that once the peak has decayed
+# background traffic (journald writes, idle network chatter) still shows as a sliver rather than a full bar
+DISK_FULL_SCALE_FLOOR = 1_000_000
+NET_FULL_SCALE_FLOOR = 100_000
+
 
 def _read_backlight_ratio(device):
     """Return a normalized brightness in [0.0, 1.0] for the given backlight device."""
@@ -32,73 +50,217 @@ def _read_backlight_ratio(device):
         return 1.0
     return r
 
+# One reading of the counters the monitors are computed from. All counters are cumulative; cpu_busy and
+# cpu_total hold one value per logical cpu, in clock ticks from /proc/stat or in seconds from psutil
+SystemSnapshot = namedtuple('SystemSnapshot', [
+    'time', 'cpu_busy', 'cpu_total', 'memory_used',
+    'disk_read_bytes', 'disk_write_bytes', 'net_sent_bytes', 'net_recv_bytes',
+])
+
+class ProcReader:
+    """Reads the system counters on Linux, keeping the /proc files open and re-reading them with pread.
+
+    Computes the same values as the psutil functions the monitors used to call: cpu_percent(percpu=True),
+    virtual_memory().percent, disk_io_counters() (whole disks only) and net_io_counters() (all interfaces).
+    """
+    FILES = ('/proc/stat', '/proc/meminfo', '/proc/diskstats', '/proc/net/dev')
+    # cpuN user nice system idle iowait irq softirq steal [guest guest_nice]
+    CPU_LINE = re.compile(rb'^cpu\d+ +([\d ]+)$', re.M)
+    MEMINFO = re.compile(rb'^(MemTotal|MemAvailable): +(\d+)', re.M)
+    # major minor name reads merged sectors_read ms writes merged sectors_written
+    DISKSTATS = re.compile(rb'^ *\d+ +\d+ (\S+) \d+ \d+ (\d+) \d+ \d+ \d+ (\d+)', re.M)
+    # name: rx_bytes rx_packets errs drop fifo frame compressed multicast tx_bytes
+    NET_DEV = re.compile(rb'^ *[^ :]+: *(\d+)(?: +\d+){7} +(\d+)', re.M)
+
+    def __init__(self):
+        self.fds = [os.open(path, os.O_RDONLY) for path in self.FILES]
+        self.sizes = [4096] * len(self.fds)
+        # diskstats name -> whether it is a whole disk (listed in /sys/block) rather than a partition
+        self.storage_devices = {}
+
+    def _read(self, i):
+        while True:
+            data = os.pread(self.fds[i], self.sizes[i], 0)
+            if len(data) < self.sizes[i]:
+                return data
+            self.sizes[i] *= 2
+
+    def _is_storage_device(self, name):
+        is_disk = self.storage_devices.get(name)
+        if is_disk is None:
+            is_disk = self.storage_devices[name] = os.path.exists(f"/sys/block/{name.decode().replace('/', '!')}")
+        return is_disk
+
+    def read(self):
+        stat, meminfo, diskstats, net_dev = (self._read(i) for i in range(len(self.fds)))
+        now = time.time()
+        cpu_busy, cpu_total = [], []
+        for line in self.CPU_LINE.findall(stat):
+            times = [int(v) for v in line.split()]
+            # guest and guest_nice are already counted in user and nice
+            total = sum(times[:8])
+            cpu_total.append(total)
+            cpu_busy.append(total - times[3] - times[4])
+        mem = dict(self.MEMINFO.findall(meminfo))
+        mem_total = int(mem[b'MemTotal'])
+        memory_used = (mem_total - int(mem[b'MemAvailable'])) / mem_total
+        disk_read = disk_write = 0
+        for name, sectors_read, sectors_written in self.DISKSTATS.findall(diskstats):
+            if self._is_storage_device(name):
+                disk_read += int(sectors_read)
+                disk_write += int(sectors_written)
+        net_recv = net_sent = 0
+        for recv, sent in self.NET_DEV.findall(net_dev):
+            net_recv += int(recv)
+            net_sent += int(sent)
+        return SystemSnapshot(now, cpu_busy, cpu_total, memory_used,
+                              disk_read * DISK_SECTOR_SIZE, disk_write * DISK_SECTOR_SIZE, net_sent, net_recv)
+
+def read_psutil_snapshot():
+    cpu_busy, cpu_total = [], []
+    for t in psutil.cpu_times(percpu=True):
+        total = sum(t) - getattr(t, 'guest', 0) - getattr(t, 'guest_nice', 0)
+        cpu_total.append(total)
+        cpu_busy.append(total - t.idle - getattr(t, 'iowait', 0))
+    disk_io = psutil.disk_io_counters()
+    net_io = psutil.net_io_counters()
+    return SystemSnapshot(
+        time.time(), cpu_busy, cpu_total, psutil.virtual_memory().percent / 100.0,
+        disk_io.read_bytes if disk_io else 0, disk_io.write_bytes if disk_io else 0,
+        net_io.bytes_sent, net_io.bytes_recv,
+    )
+
+_proc_reader = None
+_snapshot = None
+def get_system_snapshot():
+    """The current SystemSnapshot, read from /proc on Linux and from psutil elsewhere."""
+    global _proc_reader, _snapshot
+    snapshot = _snapshot
+    if snapshot is not None and time.time() - snapshot.time < SNAPSHOT_MAX_AGE_SEC:
+        return snapshot
+    if _proc_reader is None:
+        _proc_reader = False
+        if sys.platform.startswith('linux'):
+            try:
+                reader = ProcReader()
+                reader.read()
+                _proc_reader = reader
+            except Exception as e:
+                log.warning(f"Cannot read the system counters from /proc, using psutil: {e}")
+    snapshot = _proc_reader.read() if _proc_reader else read_psutil_snapshot()
+    _snapshot = snapshot
+    return snapshot
+
+class HistoryRing:
+    """The last `size` samples of `width` values each, with their times, in a numpy ring buffer.
+
+    Appending is O(1) and keeps a running sum of each column, so means over the window and rates
+    of change of cumulative counters over the window need no pass over the history.
+    """
+    def __init__(self, size, width=1):
+        self.size = size
+        self.values = np.zeros((size, width))
+        self.times = np.zeros(size)
+        self.sum = np.zeros(width)
+        self.count = 0
+        # Where the next sample goes; once the ring is full, also where the oldest one is
+        self.index = 0
+
+    def append(self, values, sample_time):
+        if self.count == self.size:
+            self.sum -= self.values[self.index]
+        else:
+            self.count += 1
+        self.values[self.index] = values
+        self.times[self.index] = sample_time
+        self.index = (self.index + 1) % self.size
+        if self.index == 0:
+            # Recompute once per lap, so rounding errors in the running sum do not accumulate
+            self.values.sum(axis=0, out=self.sum)
+        else:
+            self.sum += self.values[self.index - 1]
+
+    def mean(self, window=None):
+        """Mean of each column over the samples in the ring, or over `window` samples if given (missing ones count as 0)."""
+        return self.sum / (window or max(self.count, 1))
+
+    def rate(self):
+        """Change per second of each column between the oldest and newest samples, for cumulative counters."""
+        if self.count < 2:
+            return np.zeros_like(self.sum)
+        newest = (self.index - 1) % self.size
+        oldest = self.index % self.size if self.count == self.size else 0
+        time_diff = self.times[newest] - self.times[oldest]
+        if time_diff <= 0:
+            return np.zeros_like(self.sum)
+        return (self.values[newest] - self.values[oldest]) / time_diff
+
+class PeakNormalizer:
+    """Scales a stream of values, such as rates, into [0, 1] against their recent peak.
+
+    By default the peak decays exponentially with the given half-life, so the scale recovers
+    after a burst. With window_sec, the peak is instead the maximum over the last window_sec
+    seconds, kept in a monotonic deque (O(1) amortised per value).
+    """
+    def __init__(self, half_life_sec=PEAK_HALF_LIFE_SEC, window_sec=None, floor=1.0):
+        self.half_life_sec = half_life_sec
+        self.window_sec = window_sec
+        # Smallest peak, in the units of the values: values below it never scale up to a full bar
+        self.floor = floor
+        self.peak = floor
+        self.peak_time = None
+        # (time, value) with decreasing values, for the rolling-window max
+        self.window = deque()
+
+    def update(self, value, sample_time):
+        """Record value, and return it scaled against the current peak."""
+        if self.window_sec is not None:
+            while self.window and self.window[-1][1] <= value:
+                self.window.pop()
+            self.window.append((sample_time, value))
+            while self.window[0][0] < sample_time - self.window_sec:
+                self.window.popleft()
+            self.peak = max(self.floor, self.window[0][1])
+        else:
+            if self.peak_time is not None and self.half_life_sec:
+                self.peak *= 0.5 ** (max(0.0, sample_time - self.peak_time) / self.half_life_sec)
+            self.peak = max(self.floor, self.peak, value)
+            self.peak_time = sample_time
+        return min(1.0, max(0.0, value / self.peak))
+
 class DiskMonitor:
-    def __init__(self, hysterisis_time = 20):
-        self.read_usage_history = [0]
-        self.write_usage_history = [0]
-        self.history_times = [0]
-        self.highest_read_rate = 0.00001
-        self.highest_write_rate = 0.00001
-        self.max_history_size = hysterisis_time
+    def __init__(self, hysterisis_time = 20, peak_half_life = PEAK_HALF_LIFE_SEC, full_scale_floor = DISK_FULL_SCALE_FLOOR):
+        # Cumulative bytes read and written
+        self.usage_history = HistoryRing(hysterisis_time, width=2)
+        self.read_peak = PeakNormalizer(peak_half_life, floor=full_scale_floor)
+        self.write_peak = PeakNormalizer(peak_half_life, floor=full_scale_floor)
 
     def get(self):
         try:
-            disk_io = psutil.disk_io_counters()
-            read_usage = disk_io.read_bytes
-            write_usage = disk_io.write_bytes
-            self.read_usage_history.append(read_usage)
-            self.write_usage_history.append(write_usage)
-            self.history_times.append(time.time())
-            if len(self.read_usage_history) > self.max_history_size:
-                self.read_usage_history = self.read_usage_history[-self.max_history_size:]
-                self.write_usage_history = self.write_usage_history[-self.max_history_size:]
-                self.history_times = self.history_times[-self.max_history_size:]
-
-            read_diff = self.read_usage_history[-1] - self.read_usage_history[0]
-            write_diff = self.write_usage_history[-1] - self.write_usage_history[0]
-            time_diff = self.history_times[-1] - self.history_times[0]
-            read_rate = read_diff / time_diff
-            write_rate = write_diff / time_diff
-            self.highest_read_rate = max(self.highest_read_rate, read_rate)
-            self.highest_write_rate = max(self.highest_write_rate, write_rate)
-            read_percent = min(1.0, read_rate / self.highest_read_rate)
-            write_percent = min(1.0, write_rate / self.highest_write_rate)
+            snapshot = get_system_snapshot()
+            self.usage_history.append((snapshot.disk_read_bytes, snapshot.disk_write_bytes), snapshot.time)
+            read_rate, write_rate = self.usage_history.rate()
+            read_percent = self.read_peak.update(read_rate, snapshot.time)
+            write_percent = self.write_peak.update(write_rate, snapshot.time)
             return read_percent, write_percent
         except Exception as e:
             print(f"Error in DiskMonitor.get(): {e}")
             return 0, 0
 
 class NetworkMonitor:
-    def __init__(self, hysterisis_time = 20):
-        self.sent_usage_history = [0]
-        self.recv_usage_history = [0]
-        self.history_times = [0]
-        self.highest_sent_rate = 0.00001
-        self.highest_recv_rate = 0.00001
-        self.max_history_size = hysterisis_time
+    def __init__(self, hysterisis_time = 20, peak_half_life = PEAK_HALF_LIFE_SEC, full_scale_floor = NET_FULL_SCALE_FLOOR):
+        # Cumulative bytes sent and received
+        self.usage_history = HistoryRing(hysterisis_time, width=2)
+        self.sent_peak = PeakNormalizer(peak_half_life, floor=full_scale_floor)
+        self.recv_peak = PeakNormalizer(peak_half_life, floor=full_scale_floor)
 
     def get(self):
         try:
-            net_io = psutil.net_io_counters()
-            sent_usage = net_io.bytes_sent
-            recv_usage = net_io.bytes_recv
-            self.sent_usage_history.append(sent_usage)
-            self.recv_usage_history.append(recv_usage)
-            self.history_times.append(time.time())
-            if len(self.sent_usage_history) > self.max_history_size:
-                self.sent_usage_history = self.sent_usage_history[-self.max_history_size:]
-                self.recv_usage_history = self.recv_usage_history[-self.max_history_size:]
-                self.history_times = self.history_times[-self.max_history_size:]
-
-            sent_diff = self.sent_usage_history[-1] - self.sent_usage_history[0]
-            recv_diff = self.recv_usage_history[-1] - self.recv_usage_history[0]
-            time_diff = self.history_times[-1] - self.history_times[0]
-            sent_rate = sent_diff / time_diff
-            recv_rate = recv_diff / time_diff
-            self.highest_sent_rate = max(self.highest_sent_rate, sent_rate)
-            self.highest_recv_rate = max(self.highest_recv_rate, recv_rate)
-            sent_percent = min(1.0, sent_rate / self.highest_sent_rate)
-            recv_percent = min(1.0, recv_rate / self.highest_recv_rate)
+            snapshot = get_system_snapshot()
+            self.usage_history.append((snapshot.net_sent_bytes, snapshot.net_recv_bytes), snapshot.time)
+            sent_rate, recv_rate = self.usage_history.rate()
+            sent_percent = self.sent_peak.update(sent_rate, snapshot.time)
+            recv_percent = self.recv_peak.update(recv_rate, snapshot.time)
             return sent_percent, recv_percent
         except Exception as e:
             print(f"Error in NetworkMonitor.get(): {e}")
@@ -107,27 +269,35 @@ class NetworkMonitor:
 class CPUMonitor:
     def __init__(self, hysterisis_time = 10):
         self.cpu_count = psutil.cpu_count() // 2 # 2 logical cores per physical core
-        self.cpu_usage_history = [[] for _ in range(self.cpu_count)]
-        self.history_times = []
+        self.cpu_usage_history = HistoryRing(hysterisis_time, width=self.cpu_count)
         self.max_history_size = hysterisis_time
+        self.last_snapshot = None
+        self.last_cpu_usage = None
+
+    def cpu_percent(self, snapshot):
+        """Busy percentage of each logical cpu since the previous snapshot, like psutil.cpu_percent(percpu=True)."""
+        last, self.last_snapshot = self.last_snapshot, snapshot
+        if last is snapshot and self.last_cpu_usage is not None:
+            return self.last_cpu_usage
+        if last is None or len(last.cpu_total) != len(snapshot.cpu_total):
+            self.last_cpu_usage = np.zeros(len(snapshot.cpu_total))
+        else:
+            busy = np.subtract(snapshot.cpu_busy, last.cpu_busy, dtype=float)
+            total = np.subtract(snapshot.cpu_total, last.cpu_total, dtype=float)
+            usage = np.divide(100.0 * busy, total, out=np.zeros_like(busy), where=total > 0)
+            self.last_cpu_usage = np.clip(usage, 0.0, 100.0, out=usage)
+        return self.last_cpu_usage
 
     def get(self):
         try:
-            cpu_usage = psutil.cpu_percent(percpu=True)
-            for i in range(self.cpu_count):
-                useage = 2 * max(cpu_usage[2*i], cpu_usage[2*i+1]) # Combine logical cores
-                if useage > 100:
-                    useage = 100
-                self.cpu_usage_history[i].append(useage / 100.0)
-            self.history_times.append(time.time())
-            if len(self.cpu_usage_history[0]) > self.max_history_size:
-                for i in range(self.cpu_count):
-                    self.cpu_usage_history[i] = self.cpu_usage_history[i][-self.max_history_size:]
-                    self.history_times = self.history_times[-self.max_history_size:]
-            cpu_percentages = [sum(core_history) / self.max_history_size for core_history in self.cpu_usage_history]
+            cpu_usage = self.cpu_percent(get_system_snapshot())
+            # Combine logical cores
+            usage = 2 * cpu_usage[:2 * self.cpu_count].reshape(self.cpu_count, 2).max(axis=1)
+            self.cpu_usage_history.append(np.minimum(usage, 100) / 100.0, time.time())
+            # Averaged over the full window, so values ramp up while the history fills
+            cpu_percentages = self.cpu_usage_history.mean(self.max_history_size)
             # Somehow cpu_percentages can have values greater than 1 so we clamp them
-            cpu_percentages = [min(1.0, max(0.0, v)) for v in cpu_percentages]
-            return cpu_percentages
+            return np.clip(cpu_percentages, 0.0, 1.0).tolist()
         except Exception as e:
             print(f"Error in CPUMonitor.get(): {e}")
             return [0] * self.cpu_count
@@ -135,7 +305,7 @@ class CPUMonitor:
 class MemoryMonitor:
     @staticmethod
     def get():
-        return psutil.virtual_memory().percent / 100.0
+        return get_system_snapshot().memory_used
     
 
 class BatteryMonitor:
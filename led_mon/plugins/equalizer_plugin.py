@@ -8,7 +8,8 @@ import time
 # Internal dependencies
 from led_mon.patterns import letters_5_x_6, numerals
 from led_mon import drawing
-from led_mon.equalizer_files.visualize import Equalizer, has_inputmodule_control
+from led_mon.equalizer_files.visualize import Equalizer, DEFAULT_ENGINE, DEFAULT_BAND_LAYOUT
+from led_mon.equalizer_files.band_engines import ENGINES, BAND_LAYOUTS
 from led_mon.shared_state import discover_led_devices
 
 log = logging.getLogger(__name__)
@@ -52,8 +53,17 @@ def normalize_input_mode(value):
     log.warning(f"Invalid equalizer input mode '{value}', defaulting to 'playback'.")
     return "playback"
 
+def normalize_choice_arg(kwargs, key, choices, default):
+    value = str(kwargs.get(key, default) or default).strip().lower()
+    if value in choices:
+        return value
+    log.warning(f"Invalid equalizer arg '{key}={value}', using default {default}.")
+    return default
+
 def run_equalizer(_, grid, foreground_value, idx, **kwargs):
     external_filter = kwargs.get('external-filter', False)
+    engine = normalize_choice_arg(kwargs, 'engine', ENGINES, DEFAULT_ENGINE)
+    band_layout = normalize_choice_arg(kwargs, 'band-layout', BAND_LAYOUTS, DEFAULT_BAND_LAYOUT)
     side = kwargs.get('side', None)
     input_mode = normalize_input_mode(kwargs.get('input-mode', 'playback'))
     input_device = kwargs.get('input-device', None)
@@ -71,10 +81,6 @@ def run_equalizer(_, grid, foreground_value, idx, **kwargs):
         log.error(f"Unexpected equalizer side arg '{side}'. Expected 'left' or 'right'.")
         return
 
-    if not has_inputmodule_control():
-        log.error("inputmodule-control is not available on PATH. Skipping equalizer startup.")
-        return
-
     if side in equalizers:
         return
     if time.time() < equalizer_retry_after.get(side, 0):
@@ -106,6 +112,8 @@ def run_equalizer(_, grid, foreground_value, idx, **kwargs):
                 silent_pulse_after_sec=silent_pulse_after_sec,
                 silent_pulse_period_sec=silent_pulse_period_sec,
                 silent_pulse_reveal_sec=silent_pulse_reveal_sec,
+                engine=engine,
+                band_layout=band_layout,
             )
             if ok is False:
                 equalizer_retry_after[side] = time.time() + EQUALIZER_RETRY_BACKOFF_SEC
@@ -113,6 +121,8 @@ def run_equalizer(_, grid, foreground_value, idx, **kwargs):
             log.error(f"Equalizer runtime error on {side} side: {e}")
             equalizer_retry_after[side] = time.time() + EQUALIZER_RETRY_BACKOFF_SEC
         finally:
+            # Releases the panel on every exit, including the early returns and errors of run()
+            eq.stop()
             if equalizers.get(side) is eq:
                 del equalizers[side]
 
@@ -1,9 +1,15 @@
 # Built In Dependencies
+import os
+import re
+import time
+import logging
+from collections import defaultdict
 from statistics import mean
 
 # Internal dependencies
 from led_mon.patterns import letters_small
 from led_mon import drawing
+from led_mon.sampler import get_sampler
 
 # External dependenciees
 import psutil
@@ -15,11 +21,121 @@ TEMP_REF = 120
 # Reference for fractional measure of fan speeds (in rpm)
 MAX_FAN_SPEED = 6_000
 
+HWMON_DIR = '/sys/class/hwmon'
+# How often to check for hwmon chips that were added or removed
+HWMON_RESCAN_SEC = 10
+# Delay before reindexing after a read failed, so a chip that keeps failing is not reindexed on every read
+HWMON_ERROR_RESCAN_SEC = 1
+
+log = logging.getLogger(__name__)
+
 #### Implement monitor functions ####
 
+def _read_text(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _names(value):
+    """A chips or labels arg as a tuple of names, or None for all of them."""
+    if not value:
+        return None
+    return (value,) if isinstance(value, str) else tuple(value)
+
+class HwmonSensors:
+    """Index of the hwmon inputs of one kind (temp or fan), optionally limited to some chips and labels.
+
+    chips limits the index to the named chips, in that order, and labels to the inputs with those labels.
+    The index is built once, and again when hwmon chips are added or removed. Each read only
+    preads the selected inputs, through file descriptors that are kept open.
+    """
+    def __init__(self, kind, scale=1, chips=None, labels=None):
+        self.kind = kind
+        self.scale = scale
+        self.input_file = re.compile(rf'{kind}\d+_input')
+        self.chips = chips
+        self.labels = labels
+        # [(chip name, [fd, ...]), ...]; chips that share a name are grouped, as psutil does
+        self.groups = []
+        self.listing = None
+        self.next_scan = 0.0
+
+    def _scan(self):
+        self.next_scan = time.monotonic() + HWMON_RESCAN_SEC
+        listing = sorted(os.listdir(HWMON_DIR))
+        if listing == self.listing:
+            return
+        self.listing = listing
+        inputs = defaultdict(list)
+        for hwmon in listing:
+            path = os.path.join(HWMON_DIR, hwmon)
+            name = _read_text(os.path.join(path, 'name')) or hwmon
+            if self.chips and name not in self.chips:
+                continue
+            # Older drivers put the inputs in the device subdir
+            for input_dir in (path, os.path.join(path, 'device')):
+                try:
+                    files = sorted(f for f in os.listdir(input_dir) if self.input_file.fullmatch(f))
+                except OSError:
+                    files = []
+                if files:
+                    break
+            for file in files:
+                label = _read_text(os.path.join(input_dir, file.replace('_input', '_label'))) or ''
+                if self.labels and label not in self.labels:
+                    continue
+                try:
+                    inputs[name].append(os.open(os.path.join(input_dir, file), os.O_RDONLY))
+                except OSError:
+                    continue
+        old_groups = self.groups
+        self.groups = [(name, inputs[name]) for name in (self.chips or inputs) if name in inputs]
+        for _, fds in old_groups:
+            for fd in fds:
+                os.close(fd)
+        log.debug(f"hwmon {self.kind} inputs: {[(name, len(fds)) for name, fds in self.groups]}")
+
+    def _drop(self, failed):
+        """Close the inputs of chips whose read failed, and reindex every chip shortly.
+
+        The chip may have gone away, or been rebound under the same hwmonN name, in which
+        case the listing is unchanged but the inputs have to be opened again.
+        """
+        for _, fds in failed:
+            for fd in fds:
+                os.close(fd)
+        self.groups = [group for group in self.groups if not any(group is f for f in failed)]
+        self.listing = None
+        self.next_scan = time.monotonic() + HWMON_ERROR_RESCAN_SEC
+
+    def read(self):
+        """Current values of the selected inputs, as [(chip name, [value, ...]), ...]."""
+        if time.monotonic() >= self.next_scan:
+            self._scan()
+        readings = []
+        failed = []
+        for group in self.groups:
+            name, fds = group
+            try:
+                readings.append((name, [int(os.pread(fd, 16, 0)) / self.scale for fd in fds]))
+            except (OSError, ValueError):
+                failed.append(group)
+        if failed:
+            self._drop(failed)
+        return readings
+
 class TemperatureMonitor:
-    @staticmethod
-    def get():
+    def __init__(self, chips=None, labels=None):
+        # Millidegrees Celsius
+        self.sensors = HwmonSensors('temp', scale=1000, chips=chips, labels=labels)
+
+    def get(self):
+        if os.path.isdir(HWMON_DIR):
+            temps = [mean(positive) for positive in
+                     ([v for v in values if v > 0] for _, values in self.sensors.read()) if positive]
+            return [t / TEMP_REF for t in temps][:8]
         temps = []
         sensors = psutil.sensors_temperatures()
         for _, entries in sensors.items():
@@ -29,8 +145,13 @@ class TemperatureMonitor:
         return list(map(lambda x: x / TEMP_REF, temps))[:8]
     
 class FanSpeedMonitor:
-    @staticmethod
-    def get():
+    def __init__(self, chips=None, labels=None):
+        self.sensors = HwmonSensors('fan', chips=chips, labels=labels)
+
+    def get(self):
+        if os.path.isdir(HWMON_DIR):
+            speeds = [v for _, values in self.sensors.read() for v in values]
+            return [s / MAX_FAN_SPEED for s in speeds][:2]
         fans = psutil.sensors_fans()
         speeds = []
         for _, entries in fans.items():
@@ -39,19 +160,40 @@ class FanSpeedMonitor:
         # We can handle up to two fan speeds on the matrix display
         return list(map(lambda x: x / MAX_FAN_SPEED, speeds))[:2]
     
-temperature_monitor = TemperatureMonitor()
-fan_speed_monitor = FanSpeedMonitor()
+MONITOR_CLASSES = {'temp': TemperatureMonitor, 'fan': FanSpeedMonitor}
+
+# Sampled in the background; set their intervals with `sample-intervals` in the config file
+sampled_monitors = {
+    (kind, None, None): get_sampler().add(kind, monitor_class().get, interval=1.0)
+    for kind, monitor_class in MONITOR_CLASSES.items()
+}
+
+def get_sampled_monitor(kind, chips=None, labels=None):
+    """The sampled monitor for one chips/labels selection, created on first use.
+
+    Each selection gets its own hwmon index and sampler entry, so apps that select different
+    sensors do not rebuild each other's index. Selections sample at the interval of the
+    unfiltered `temp` or `fan` monitor.
+    """
+    chips, labels = _names(chips), _names(labels)
+    key = (kind, chips, labels)
+    monitor = sampled_monitors.get(key)
+    if monitor is None:
+        name = f"{kind}:{'/'.join(chips or ['*'])}:{'/'.join(labels or ['*'])}"
+        interval = sampled_monitors[(kind, None, None)].interval
+        monitor = sampled_monitors[key] = get_sampler().add(name, MONITOR_CLASSES[kind](chips, labels).get, interval=interval)
+    return monitor
 
 #### Implement high-level drawing functions to be called by app functions below ####
 
 draw_app = getattr(drawing, 'draw_app')
 
-def draw_temps(arg, grid, foreground_value, idx):
-    temp_values = temperature_monitor.get()
+def draw_temps(arg, grid, foreground_value, idx, **kwargs):
+    temp_values = get_sampled_monitor('temp', kwargs.get('chips'), kwargs.get('labels')).get()
     draw_app(arg, grid, temp_values, foreground_value, idx)
         
-def draw_fans(arg, grid, foreground_value, idx):
-    fan_speeds = fan_speed_monitor.get()
+def draw_fans(arg, grid, foreground_value, idx, **kwargs):
+    fan_speeds = get_sampled_monitor('fan', kwargs.get('chips'), kwargs.get('labels')).get()
     draw_app(arg, grid, fan_speeds[0], foreground_value, bar_x_offset=1, y=idx)
     draw_app(arg, grid, fan_speeds[1], foreground_value, bar_x_offset=5, y=idx)
     
@@ -0,0 +1,129 @@
+# Samples the monitors on a background thread, each at its own interval, so that slow reads (sensors_temperatures()
+# walks every hwmon directory) do not add to the render loop's frame time. Renderers get the latest published value,
+# which never blocks.
+#
+# The main loop's monitors and the temp/fan plugin's monitors are registered here. Their intervals can be set with
+# the `sample-intervals` mapping in the config file, e.g. `sample-intervals: {temp: 2, cpu: 0.1}`.
+
+# Built In Dependencies
+import time
+import threading
+import math
+import logging
+
+log = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SEC = 0.1
+# Monitors that have not been read for this long are not sampled again until they are next read
+IDLE_SEC = 10.0
+
+
+class SampledMonitor:
+    """Latest-value slot for one monitor, filled by the sampler thread.
+
+    Drop-in replacement for the monitor it wraps: get() returns the most recent sample.
+    The first read, and the first read after the monitor went idle, samples synchronously.
+    """
+    def __init__(self, sampler, name, fn, interval):
+        self.sampler = sampler
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        # (monotonic time, value) of the last sample, replaced as a whole so readers need no lock
+        self.latest = None
+        self.last_read = float('-inf')
+        self.next_due = 0.0
+        self.errors = 0
+
+    def get(self):
+        now = time.monotonic()
+        if now - self.last_read > IDLE_SEC:
+            self.sample()
+            self.next_due = now + self.interval
+            self.last_read = now
+            self.sampler.wake()
+        self.last_read = now
+        latest = self.latest
+        return latest[1] if latest is not None else None
+
+    @property
+    def idle(self):
+        return time.monotonic() - self.last_read > IDLE_SEC
+
+    def sample(self):
+        try:
+            value = self.fn()
+        except Exception as e:
+            self.errors += 1
+            if self.errors == 1:
+                log.warning(f"Sampling {self.name} failed, keeping the last value: {e}")
+            return
+        self.latest = (time.monotonic(), value)
+
+
+class MetricSampler:
+    def __init__(self):
+        self.monitors = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def add(self, name, fn, interval=DEFAULT_INTERVAL_SEC):
+        """Sample fn every interval seconds under name. Returns the SampledMonitor to read it from."""
+        monitor = SampledMonitor(self, name, fn, interval)
+        with self._lock:
+            self.monitors[name] = monitor
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='metric-sampler', daemon=True)
+                self._thread.start()
+        return monitor
+
+    def set_intervals(self, intervals):
+        """Apply the sample-intervals config mapping. Invalid entries are skipped with a warning."""
+        if not intervals:
+            return
+        if not isinstance(intervals, dict):
+            log.warning(f"sample-intervals: expected a mapping of monitor name to seconds, got {intervals!r}")
+            return
+        for name, value in intervals.items():
+            if name not in self.monitors:
+                log.warning(f"sample-intervals: no monitor named {name}")
+                continue
+            try:
+                interval = float(value)
+            except (TypeError, ValueError):
+                interval = math.nan
+            if not math.isfinite(interval) or interval <= 0:
+                log.warning(f"sample-intervals: invalid interval {value!r} for {name}, keeping {self.monitors[name].interval}s")
+                continue
+            self.monitors[name].interval = interval
+        self.wake()
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            now = time.monotonic()
+            wait = IDLE_SEC
+            for monitor in list(self.monitors.values()):
+                if monitor.idle:
+                    continue
+                if now >= monitor.next_due:
+                    monitor.sample()
+                    monitor.next_due = now + monitor.interval
+                wait = min(wait, monitor.next_due - time.monotonic())
+            self._wake.wait(max(0.0, wait))
+            self._wake.clear()
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+def get_sampler():
+    """The process-wide sampler; its thread starts when the first monitor is added."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = MetricSampler()
+        return _sampler
@@ -3,8 +3,22 @@ foreground_value = 0
 
 from serial.tools import list_ports
 import re
+import os
+
+# Comma-separated <location>=<serial device> pairs that replace USB discovery, e.g. to use the
+# emulated panels from led_mon/fake_matrix.py: LED_MATRIX_DEVICES=fake-1=/dev/pts/5,fake-2=/dev/pts/6
+DEVICE_OVERRIDE_ENV = 'LED_MATRIX_DEVICES'
+
+def get_device_overrides():
+    value = os.environ.get(DEVICE_OVERRIDE_ENV, '').strip()
+    if not value:
+        return None
+    return [tuple(entry.strip().split('=', 1)) for entry in value.split(',') if '=' in entry]
 
 def discover_led_devices():
+    overrides = get_device_overrides()
+    if overrides is not None:
+        return overrides
     locations = []
     try:
         device_list = list_ports.comports()
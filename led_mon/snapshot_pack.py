@@ -0,0 +1,165 @@
+# Packs a directory of snapshot json files into a single binary file that is memory-mapped when loaded.
+#
+#   python -m led_mon.snapshot_pack led_mon/snapshot_files -o led_mon/snapshots.ledpack
+#   python -m led_mon.snapshot_pack --list led_mon/snapshots.ledpack
+#
+# Point a snap app's `path` arg at the pack instead of a directory; `file` and `panel` are looked up as before.
+#
+# Layout (little endian):
+#   header   8s magic, u16 version, u32 index length
+#   index    utf-8 json: [{"name", "format", "frames", "offset"}, ...], names relative to the packed directory
+#   frames   per entry, at a 64 byte aligned offset: "uint8" frames are 9x34 bytes in (x, y) order,
+#            "bits" frames are 39 bytes in the DrawBW layout (bit x + 9*y, least significant bit first)
+
+# Built In Dependencies
+import os
+import sys
+import json
+import mmap
+import struct
+from argparse import ArgumentParser
+
+# External Dependencies
+import numpy as np
+
+# Not imported from drawing.py, which imports this module
+PANEL_WIDTH = 9
+PANEL_HEIGHT = 34
+BITS_FRAME_BYTES = 39
+
+PACK_MAGIC = b'LEDSNAP\x00'
+PACK_VERSION = 1
+PACK_SUFFIX = '.ledpack'
+HEADER = struct.Struct('<8sHI')
+ALIGNMENT = 64
+FORMATS = ('auto', 'uint8', 'bits')
+
+
+def unpack_bits(frames):
+    """(n, 39) DrawBW frames to (n, 9, 34) arrays of 0 and 1."""
+    bits = np.unpackbits(frames, axis=-1, bitorder='little')[:, :PANEL_WIDTH * PANEL_HEIGHT]
+    return bits.reshape(-1, PANEL_HEIGHT, PANEL_WIDTH).transpose(0, 2, 1)
+
+def pack_bits(frames):
+    """(n, 9, 34) arrays of 0 and 1 to (n, 39) DrawBW frames."""
+    bits = np.zeros((len(frames), BITS_FRAME_BYTES * 8), dtype=np.uint8)
+    bits[:, :PANEL_WIDTH * PANEL_HEIGHT] = frames.transpose(0, 2, 1).reshape(len(frames), -1)
+    return np.packbits(bits, axis=-1, bitorder='little')
+
+def decode_snapshot(snap, name='snapshot'):
+    """Decoded snapshot json as an (n, 9, 34) uint8 array of frames.
+
+    Accepts a single grid of 34 rows of 9 values, a list of such grids (an animation),
+    or the 39 byte DrawBW form of the `_raw` files, single or as a list.
+    """
+    snap = np.array(snap)
+    if snap.ndim in (1, 2) and snap.shape[-1] == BITS_FRAME_BYTES:
+        return unpack_bits(snap.reshape(-1, BITS_FRAME_BYTES).astype(np.uint8))
+    if snap.ndim == 2:
+        snap = snap[np.newaxis]
+    if snap.ndim != 3 or snap.shape[1:] != (PANEL_HEIGHT, PANEL_WIDTH):
+        raise ValueError(f"{name}: expected {PANEL_HEIGHT} rows of {PANEL_WIDTH} values per frame, got shape {snap.shape}")
+    if snap.min() < 0 or snap.max() > 255:
+        raise ValueError(f"{name}: values must be within 0-255")
+    return np.ascontiguousarray(snap.transpose(0, 2, 1), dtype=np.uint8)
+
+
+def compile_pack(snapshot_dir, pack_file, frame_format='auto'):
+    """Pack every json file under snapshot_dir into pack_file. Returns the index."""
+    entries = []
+    for root, dirs, files in os.walk(snapshot_dir):
+        dirs.sort()
+        for file in sorted(files):
+            if not file.endswith('.json'):
+                continue
+            file_path = os.path.join(root, file)
+            name = os.path.relpath(file_path, snapshot_dir).replace(os.sep, '/')
+            with open(file_path) as f:
+                frames = decode_snapshot(json.load(f), name)
+            binary = frames.max() <= 1
+            if frame_format == 'bits' and not binary:
+                raise ValueError(f"{name}: bits format only holds values of 0 and 1")
+            fmt = 'bits' if frame_format == 'bits' or (frame_format == 'auto' and binary) else 'uint8'
+            data = pack_bits(frames) if fmt == 'bits' else frames
+            entries.append(({'name': name, 'format': fmt, 'frames': len(frames)}, data.tobytes()))
+
+    # The offsets are part of the index, so size the index with placeholder offsets first
+    index = [entry for entry, _ in entries]
+    for entry in index:
+        entry['offset'] = 0xFFFFFFFF
+    index_length = len(json.dumps(index).encode())
+    offset = _align(HEADER.size + index_length)
+    for entry, data in entries:
+        entry['offset'] = offset
+        offset = _align(offset + len(data))
+    index_bytes = json.dumps(index).encode().ljust(index_length)
+
+    with open(pack_file, 'wb') as f:
+        f.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        for entry, data in entries:
+            f.write(b'\x00' * (entry['offset'] - f.tell()))
+            f.write(data)
+    return index
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class SnapshotPack:
+    """A memory-mapped snapshot pack. Frames are returned as read-only views into the mapping."""
+    def __init__(self, pack_file):
+        self.pack_file = pack_file
+        with open(pack_file, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_length = HEADER.unpack_from(self._mmap)
+        if magic != PACK_MAGIC:
+            raise ValueError(f"{pack_file} is not a snapshot pack")
+        if version != PACK_VERSION:
+            raise ValueError(f"{pack_file}: unsupported snapshot pack version {version}")
+        index = json.loads(self._mmap[HEADER.size:HEADER.size + index_length])
+        self.entries = {entry['name']: entry for entry in index}
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def frame_count(self, name):
+        return self.entries[name]['frames']
+
+    def frames(self, name):
+        """All frames of an entry: (n, 9, 34) for uint8 entries, (n, 39) DrawBW bytes for bits entries."""
+        entry = self.entries[name]
+        shape = (PANEL_WIDTH, PANEL_HEIGHT) if entry['format'] == 'uint8' else (BITS_FRAME_BYTES,)
+        count = entry['frames'] * int(np.prod(shape))
+        data = np.frombuffer(self._mmap, dtype=np.uint8, count=count, offset=entry['offset'])
+        return data.reshape((entry['frames'],) + shape)
+
+    def frame(self, name, index=0):
+        """One frame as a (9, 34) array; a view for uint8 entries, unpacked for bits entries."""
+        frames = self.frames(name)
+        index %= len(frames)
+        if self.entries[name]['format'] == 'uint8':
+            return frames[index]
+        return unpack_bits(frames[index:index + 1])[0]
+
+    def close(self):
+        self._mmap.close()
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description="Pack snapshot json files into a memory-mapped snapshot pack")
+    parser.add_argument('source', help="Snapshot directory to pack, or a pack to list with --list")
+    parser.add_argument('-o', '--output', help=f"Pack file to write (default: <source>{PACK_SUFFIX})")
+    parser.add_argument('--format', choices=FORMATS, default='auto',
+                        help="Frame storage; auto uses bits for snapshots that only hold 0 and 1")
+    parser.add_argument('--list', action='store_true', help="List the entries of an existing pack")
+    args = parser.parse_args()
+
+    if args.list:
+        pack = SnapshotPack(args.source)
+        for name, entry in pack.entries.items():
+            print(f"{name}: {entry['frames']} frame(s), {entry['format']}")
+        sys.exit(0)
+    output = args.output or args.source.rstrip('/' + os.sep) + PACK_SUFFIX
+    index = compile_pack(args.source, output, args.format)
+    print(f"Packed {len(index)} snapshots into {output} ({os.path.getsize(output)} bytes)")
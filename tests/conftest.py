@@ -0,0 +1,52 @@
+# Built In Dependencies
+import os
+
+# External Dependencies
+import pytest
+
+# drawing.py loads every plugin on import unless this is set. Plugin renderers are the same draw functions
+# registered under other app names, so the tests do not need the plugins' dependencies.
+os.environ.setdefault('LED_MATRIX_DISABLE_PLUGINS', '1')
+
+try:
+    from pytest_benchmark.utils import parse_compare_fail
+except ImportError:
+    parse_compare_fail = None
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--max-slowdown',
+        metavar='PERCENT',
+        type=int,
+        default=None,
+        help="Compare against the latest saved benchmark run (see --benchmark-autosave) and fail "
+             "when a renderer's mean time is more than PERCENT slower (needs pytest-benchmark)",
+    )
+
+
+class RunOnceBenchmark:
+    """Registered in place of pytest-benchmark when it is missing: the benchmark fixture
+    calls the function once, so the tests' output checks still run."""
+    group = None
+
+    def __call__(self, fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+    @pytest.fixture
+    def benchmark(self):
+        return self
+
+
+def pytest_configure(config):
+    max_slowdown = config.getoption('--max-slowdown')
+    if not config.pluginmanager.hasplugin('benchmark'):
+        if max_slowdown is not None:
+            raise pytest.UsageError("--max-slowdown needs pytest-benchmark (pip install pytest-benchmark)")
+        config.pluginmanager.register(RunOnceBenchmark(), 'run-once-benchmark')
+        return
+    if max_slowdown is None:
+        return
+    config.option.benchmark_compare_fail = [parse_compare_fail(f'mean:{max_slowdown}%')]
+    if not config.option.benchmark_compare:
+        config.option.benchmark_compare = True
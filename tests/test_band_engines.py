@@ -0,0 +1,45 @@
+# FFTBandEngine: each band's energy from an FFT long enough to resolve it.
+
+# External Dependencies
+import numpy as np
+import pytest
+
+# Internal Dependencies
+from led_mon.equalizer_files.band_engines import FFTBandEngine, IIRBandEngine, centered_band_edges
+
+SAMPLE_RATE = 48000
+CHUNK_SIZE = 1024
+MAX_WINDOW = 8192
+BAND_CENTERS = [31.5, 63, 125, 250, 500, 1000, 2000, 4000, 8000]
+BAND_EDGES = centered_band_edges(BAND_CENTERS, 1 / 1.414, 1.414)
+
+
+def tone(hz, samples=MAX_WINDOW):
+    t = np.arange(samples) / SAMPLE_RATE
+    return np.sin(2 * np.pi * hz * t).astype(np.float32)
+
+
+def test_low_bands_get_longer_windows():
+    engine = FFTBandEngine(BAND_EDGES, SAMPLE_RATE, CHUNK_SIZE, max_window=MAX_WINDOW)
+    sizes = {int(band): size for size, bands, *_ in engine.groups for band in bands}
+    assert sizes[0] == MAX_WINDOW and engine.window_size == MAX_WINDOW
+    assert sizes[0] > sizes[1] > sizes[2] > sizes[3] == CHUNK_SIZE
+    assert all(sizes[band] == CHUNK_SIZE for band in range(3, len(BAND_CENTERS)))
+
+
+@pytest.mark.parametrize('band', [0, 1, 5])
+def test_tone_lands_in_its_band(band):
+    engine = FFTBandEngine(BAND_EDGES, SAMPLE_RATE, CHUNK_SIZE, max_window=MAX_WINDOW)
+    rms = engine.band_rms(tone(BAND_CENTERS[band]))
+    assert np.argmax(rms) == band
+    # A full-scale sine has an RMS of 1/sqrt(2), as the band-pass filter bank reports
+    assert rms[band] == pytest.approx(1 / np.sqrt(2), rel=0.05)
+    assert np.delete(rms, band).max() < 0.25 * rms[band]
+
+
+def test_without_max_window_one_chunk_is_used():
+    engine = FFTBandEngine(BAND_EDGES, SAMPLE_RATE, CHUNK_SIZE)
+    assert engine.window_size == CHUNK_SIZE
+    rms = engine.band_rms(tone(1000, CHUNK_SIZE))
+    iir = IIRBandEngine(BAND_EDGES, SAMPLE_RATE).band_rms(tone(1000, CHUNK_SIZE))
+    assert np.argmax(rms) == np.argmax(iir) == 5
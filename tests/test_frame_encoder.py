@@ -0,0 +1,158 @@
+# FrameEncoder.encode_changes, checked by feeding its packets to an emulated panel (fake_matrix.py).
+
+# Built In Dependencies
+import time
+
+# External Dependencies
+import numpy as np
+import pytest
+
+# Internal Dependencies
+from led_mon import drawing
+from led_mon.commands import Commands
+from led_mon.drawing import FrameEncoder, STAGE_COL_PACKET_LEN, FLUSH_COLS_PACKET
+from led_mon.fake_matrix import FakeLEDMatrix, device_override
+from led_mon.shared_state import DEVICE_OVERRIDE_ENV
+
+FILL = 80
+
+
+@pytest.fixture
+def fake_panel():
+    panel = FakeLEDMatrix(brightness=100)
+    yield panel
+    panel.stop()
+
+
+def feed(panel, packet):
+    """Parse packet on the emulated panel, as if it had been written to its tty."""
+    panel._buffer += bytes(packet)
+    panel._parse()
+    assert panel.bad_bytes == 0
+
+
+def greyscale_frame():
+    grid = np.zeros((drawing.PANEL_WIDTH, drawing.PANEL_HEIGHT), dtype=drawing.FRAME_DTYPE)
+    grid[:, 5] = np.arange(drawing.PANEL_WIDTH) * 20 + 10
+    return grid
+
+
+def test_full_frame_is_one_write(fake_panel):
+    encoder = FrameEncoder()
+    # The module is known to be at the base brightness, so no Brightness command leads the frame
+    encoder.set_base_brightness(drawing.DEFAULT_HW_BRIGHTNESS)
+    grid = greyscale_frame()
+    packet = bytes(encoder.encode_changes(grid))
+    # StageCol for every column, then FlushCols, in the one preallocated buffer
+    assert len(packet) == drawing.PANEL_WIDTH * STAGE_COL_PACKET_LEN + len(FLUSH_COLS_PACKET)
+    assert [packet[i * STAGE_COL_PACKET_LEN + 2] for i in range(drawing.PANEL_WIDTH)] == [Commands.StageCol] * drawing.PANEL_WIDTH
+    assert packet.endswith(FLUSH_COLS_PACKET)
+    assert encoder.encode(grid).obj is encoder.buffer
+    feed(fake_panel, packet)
+    np.testing.assert_array_equal(fake_panel.framebuffer, grid)
+    assert fake_panel.commands[Commands.FlushCols] == 1
+
+
+def test_identical_frame_is_skipped(fake_panel):
+    encoder = FrameEncoder()
+    feed(fake_panel, encoder.encode_changes(greyscale_frame()))
+    assert encoder.encode_changes(greyscale_frame()) is None
+    assert encoder.frames_skipped == 1
+
+
+def test_only_changed_columns_are_sent(fake_panel):
+    encoder = FrameEncoder()
+    grid = greyscale_frame()
+    feed(fake_panel, encoder.encode_changes(grid))
+    grid = grid.copy()
+    grid[3, 10] = 200
+    grid[7, 0] = 1
+    packet = bytes(encoder.encode_changes(grid))
+    assert len(packet) == 2 * STAGE_COL_PACKET_LEN + len(FLUSH_COLS_PACKET)
+    assert [packet[i * STAGE_COL_PACKET_LEN + 3] for i in range(2)] == [3, 7]
+    feed(fake_panel, packet)
+    np.testing.assert_array_equal(fake_panel.framebuffer, grid)
+    assert encoder.columns_skipped == drawing.PANEL_WIDTH - 2
+
+
+def test_two_level_frame_is_sent_as_draw_bw(fake_panel):
+    encoder = FrameEncoder(draw_bw=True)
+    grid = np.zeros((drawing.PANEL_WIDTH, drawing.PANEL_HEIGHT), dtype=drawing.FRAME_DTYPE)
+    grid[1, 2] = grid[8, 33] = grid[0, 0] = FILL
+    packet = bytes(encoder.encode_changes(grid))
+    assert packet[-40] == Commands.DrawBW
+    bits = packet[-39:]
+    # Pixel (x, y) is bit x + 9 * y, least significant bit first
+    for x, y in ((1, 2), (8, 33), (0, 0)):
+        index = x + drawing.PANEL_WIDTH * y
+        assert bits[index // 8] >> (index % 8) & 1
+    assert sum(bin(b).count('1') for b in bits) == 3
+    feed(fake_panel, packet)
+    np.testing.assert_array_equal(fake_panel.framebuffer, (grid != 0) * 255)
+
+
+def test_brightness_follows_the_module_base_level(fake_panel):
+    encoder = FrameEncoder(draw_bw=True)
+    encoder.set_base_brightness(fake_panel.brightness)
+    bw = np.zeros((drawing.PANEL_WIDTH, drawing.PANEL_HEIGHT), dtype=drawing.FRAME_DTYPE)
+    bw[2:5, 3:20] = FILL
+    feed(fake_panel, encoder.encode_changes(bw))
+    assert fake_panel.brightness == FILL * 100 // 255
+    assert fake_panel.commands[Commands.DrawBW] == 1
+
+    grey = bw.copy()
+    grey[0, 0] = 200
+    feed(fake_panel, encoder.encode_changes(grey))
+    # Greyscale frames put the module's own level back, and are sent in full after a DrawBW
+    assert fake_panel.brightness == 100
+    np.testing.assert_array_equal(fake_panel.framebuffer, grey)
+    assert fake_panel.commands[Commands.StageCol] == drawing.PANEL_WIDTH
+    # Both kinds of frame show a pixel of the same value at the same brightness
+    assert fake_panel.snapshot()[3, 5] == FILL * 100 // 255
+
+
+@pytest.mark.parametrize('transport', drawing.TRANSPORTS)
+def test_repeated_animate_value_does_not_defeat_skipping(monkeypatch, transport):
+    fake = FakeLEDMatrix(brightness=100).start()
+    monkeypatch.setenv(DEVICE_OVERRIDE_ENV, device_override([fake]))
+    monkeypatch.setattr(drawing, 'transport', transport)
+    panel = drawing.acquire_panel(fake.location)
+    try:
+        assert panel.frame_encoder.base_brightness == 100
+        grid = np.zeros((drawing.PANEL_WIDTH, drawing.PANEL_HEIGHT), dtype=drawing.FRAME_DTYPE)
+        grid[2:5, 3:20] = FILL
+        for _ in range(10):
+            panel.input_queue.put((grid.copy(), False))
+            time.sleep(0.01)
+        time.sleep(0.3)
+        assert fake.frames == 1
+        assert fake.commands[Commands.Animate] == 1  # Only the one sent when the panel was opened
+        assert panel.frames_skipped == 9
+    finally:
+        drawing.release_panel(panel)
+        panel.join(1.0)
+        fake.stop()
+
+
+@pytest.mark.parametrize('transport', drawing.TRANSPORTS)
+def test_overlay_restores_the_frame_as_it_was_sent(monkeypatch, transport):
+    fake = FakeLEDMatrix(brightness=100).start()
+    monkeypatch.setenv(DEVICE_OVERRIDE_ENV, device_override([fake]))
+    monkeypatch.setattr(drawing, 'transport', transport)
+    panel = drawing.acquire_panel(fake.location)
+    try:
+        grid = greyscale_frame()
+        sent = grid.copy()
+        panel.input_queue.put((grid, False))
+        time.sleep(0.1)
+        overlay = np.full((drawing.PANEL_WIDTH, drawing.PANEL_HEIGHT), 255, dtype=drawing.FRAME_DTYPE)
+        drawing.draw_overlay([overlay], 0.1, locations=[fake.location])
+        # The producer reuses its ring buffer while the overlay plays
+        grid[:, :] = 400
+        time.sleep(0.4)
+        np.testing.assert_array_equal(fake.framebuffer, sent)
+        assert grid[0, 0] == 400  # The transport never clamped the producer's buffer
+    finally:
+        drawing.release_panel(panel)
+        panel.join(1.0)
+        fake.stop()
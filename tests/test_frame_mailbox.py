@@ -0,0 +1,99 @@
+# FrameMailbox: latest-frame-wins coalescing, animate carry-over and priority hand-off between frame producers.
+
+# Built In Dependencies
+import queue
+
+# External Dependencies
+import numpy as np
+import pytest
+
+# Internal Dependencies
+from led_mon import drawing
+from led_mon.drawing import FrameMailbox, Overlay, PRIORITY_APPS, PRIORITY_EQUALIZER, PRIORITY_ID
+
+
+def frame(value):
+    return np.full((drawing.PANEL_WIDTH, drawing.PANEL_HEIGHT), value, dtype=drawing.FRAME_DTYPE)
+
+
+def test_latest_frame_wins():
+    mailbox = FrameMailbox()
+    for value in (1, 2, 3):
+        mailbox.put((frame(value), None))
+    grid, animate = mailbox.get(block=False)
+    assert grid[0, 0] == 3 and animate is None
+    assert mailbox.frames_coalesced == 2
+    with pytest.raises(queue.Empty):
+        mailbox.get(block=False)
+
+
+def test_replaced_frame_keeps_its_animate_change():
+    mailbox = FrameMailbox()
+    mailbox.put((frame(1), True))
+    mailbox.put((frame(2), None))
+    grid, animate = mailbox.get(block=False)
+    assert grid[0, 0] == 2 and animate is True
+
+
+def test_higher_priority_owns_the_panel_until_released():
+    mailbox = FrameMailbox()
+    mailbox.put((frame(1), True), priority=PRIORITY_APPS)
+    assert mailbox.get(block=False)[1] is True
+
+    mailbox.put((frame(10), False), priority=PRIORITY_EQUALIZER)
+    assert mailbox.get(block=False)[0][0, 0] == 10
+    # The apps' frames are held back while the equalizer owns the panel
+    mailbox.put((frame(2), None), priority=PRIORITY_APPS)
+    with pytest.raises(queue.Empty):
+        mailbox.get(block=False)
+
+    mailbox.release(PRIORITY_EQUALIZER)
+    grid, animate = mailbox.get(block=False)
+    # The apps' latest frame comes back, with the animation they had turned on
+    assert grid[0, 0] == 2 and animate is True
+
+
+def test_frames_after_release_are_dropped_until_claimed():
+    mailbox = FrameMailbox()
+    mailbox.put((frame(1), None), priority=PRIORITY_APPS)
+    mailbox.put((frame(10), False), priority=PRIORITY_EQUALIZER)
+    mailbox.get(block=False)
+    mailbox.release(PRIORITY_EQUALIZER)
+    assert mailbox.get(block=False)[0][0, 0] == 1
+    # A frame the stopping producer put after its release must not take the panel back
+    mailbox.put((frame(11), None), priority=PRIORITY_EQUALIZER)
+    with pytest.raises(queue.Empty):
+        mailbox.get(block=False)
+    mailbox.put((frame(2), None), priority=PRIORITY_APPS)
+    assert mailbox.get(block=False)[0][0, 0] == 2
+
+    mailbox.claim(PRIORITY_EQUALIZER)
+    mailbox.put((frame(12), False), priority=PRIORITY_EQUALIZER)
+    assert mailbox.get(block=False)[0][0, 0] == 12
+
+
+def test_release_of_a_lower_priority_does_not_redraw():
+    mailbox = FrameMailbox()
+    mailbox.put((frame(1), None), priority=PRIORITY_APPS)
+    mailbox.put((frame(20), False), priority=PRIORITY_ID)
+    assert mailbox.get(block=False)[0][0, 0] == 20
+    mailbox.release(PRIORITY_APPS)
+    with pytest.raises(queue.Empty):
+        mailbox.get(block=False)
+
+
+def test_overlay_is_returned_first():
+    mailbox = FrameMailbox()
+    mailbox.put((frame(1), None))
+    overlay = Overlay([frame(5)], 0.01)
+    mailbox.put_overlay(overlay)
+    assert mailbox.get(block=False) is overlay
+    assert mailbox.get(block=False)[0][0, 0] == 1
+
+
+def test_close_stops_the_reader():
+    mailbox = FrameMailbox()
+    mailbox.put((frame(1), None))
+    mailbox.put(None)
+    assert mailbox.closed
+    assert mailbox.get() is None
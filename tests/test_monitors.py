@@ -0,0 +1,82 @@
+# Benchmarks for the per-tick work of the monitors in monitors.py, fed with synthetic counters.
+
+# External Dependencies
+import numpy as np
+import pytest
+
+# Internal Dependencies
+from led_mon import monitors
+from led_mon.monitors import HistoryRing, PeakNormalizer, SystemSnapshot
+
+LOGICAL_CPUS = 64
+
+
+def test_history_ring_window():
+    rng = np.random.default_rng(1)
+    ring = HistoryRing(10, width=3)
+    samples = []
+    for i in range(57):
+        values = rng.random(3)
+        ring.append(values, i * 0.1)
+        samples.append((values, i * 0.1))
+        window = samples[-10:]
+        np.testing.assert_allclose(ring.mean(10), sum(v for v, _ in window) / 10)
+        if len(window) > 1:
+            expected_rate = (window[-1][0] - window[0][0]) / (window[-1][1] - window[0][1])
+            np.testing.assert_allclose(ring.rate(), expected_rate)
+
+
+def test_peak_normalizer_window_max():
+    rng = np.random.default_rng(3)
+    normalizer = PeakNormalizer(window_sec=2.0)
+    samples = []
+    for i in range(200):
+        value, sample_time = rng.random() * 100, i * 0.1
+        samples.append((sample_time, value))
+        scaled = normalizer.update(value, sample_time)
+        peak = max(v for t, v in samples if t >= sample_time - 2.0)
+        assert scaled == pytest.approx(value / peak)
+
+
+def test_peak_normalizer_recovers_after_burst():
+    normalizer = PeakNormalizer(half_life_sec=60)
+    normalizer.update(1000.0, 0.0)
+    assert normalizer.update(10.0, 1.0) < 0.02
+    # Five half-lives later the burst's peak has fallen to about 31
+    assert normalizer.update(10.0, 300.0) > 0.3
+
+
+def test_idle_traffic_stays_small_after_a_long_decay():
+    normalizer = PeakNormalizer(half_life_sec=60, floor=monitors.NET_FULL_SCALE_FLOOR)
+    normalizer.update(50e6, 0.0)
+    # An hour on, the burst's peak has decayed far below the floor; a few kB/s of chatter is still a sliver
+    for minute in range(1, 61):
+        scaled = normalizer.update(2000.0, minute * 60.0)
+    assert scaled == pytest.approx(2000.0 / monitors.NET_FULL_SCALE_FLOOR)
+    assert scaled < 0.05
+
+
+@pytest.fixture
+def snapshots(monkeypatch):
+    """Make get_system_snapshot return a new snapshot of busy cpus and growing io counters on every call."""
+    rng = np.random.default_rng(2)
+    state = {'tick': 0, 'busy': np.zeros(LOGICAL_CPUS), 'total': np.zeros(LOGICAL_CPUS)}
+
+    def next_snapshot():
+        state['tick'] += 1
+        state['busy'] += rng.integers(0, 10, LOGICAL_CPUS)
+        state['total'] += 10
+        tick = state['tick']
+        return SystemSnapshot(tick * 0.1, list(state['busy']), list(state['total']), 0.5,
+                              tick * 4096, tick * 8192, tick * 1500, tick * 3000)
+
+    monkeypatch.setattr(monitors, 'get_system_snapshot', next_snapshot)
+    monkeypatch.setattr(monitors.psutil, 'cpu_count', lambda: LOGICAL_CPUS)
+
+
+@pytest.mark.parametrize('monitor_class', [monitors.CPUMonitor, monitors.DiskMonitor, monitors.NetworkMonitor])
+def test_monitor_get(benchmark, snapshots, monitor_class):
+    monitor = monitor_class()
+    benchmark.group = 'monitors'
+    values = benchmark(monitor.get)
+    assert all(0.0 <= v <= 1.0 for v in values)
@@ -0,0 +1,73 @@
+# Benchmarks for the panel renderers in drawing.py, checked against golden grids.
+#
+#   pytest tests --benchmark-autosave        # save a baseline
+#   pytest tests --max-slowdown 10           # fail if a renderer got more than 10% slower than the baseline
+#   UPDATE_GOLDEN=1 pytest tests             # rewrite the golden grids after an intended visual change
+
+# Built In Dependencies
+import os
+import json
+from pathlib import Path
+
+# External Dependencies
+import numpy as np
+import pytest
+
+# Internal Dependencies
+from led_mon import drawing
+
+GOLDEN_DIR = Path(__file__).parent / 'golden'
+FILL = 100
+CPU_VALUES = [0.05, 0.2, 0.35, 0.5, 0.65, 0.8, 0.95, 1.0]
+
+# name -> (renderer, args, kwargs); every renderer gets grid as its first argument
+CASES = {
+    'spiral_top': (drawing.draw_spiral_vals, (CPU_VALUES, FILL, 0), {}),
+    'spiral_bottom': (drawing.draw_spiral_vals, (CPU_VALUES[::-1], FILL, 16), {}),
+    'bar_top_left': (drawing.draw_bar, (0.63, FILL), {'bar_x_offset': 1, 'y': 0}),
+    'bar_bottom_right': (drawing.draw_bar, (0.21, FILL), {'bar_x_offset': 5, 'y': 16}),
+    'memory': (drawing.draw_memory, (0.42, FILL, 16), {}),
+    'battery_discharging': (drawing.draw_battery, (0.55, False, FILL, 19), {}),
+    'battery_charging': (drawing.draw_battery, (0.8, True, FILL, 3), {}),
+    'chars_time': (drawing.draw_chars_list, (['1', '2', 'horiz_colon', '3', '4'], FILL, 1), {}),
+    'chars_weather': (drawing.draw_chars_list, (['clouds', '1', '7', 'degC'], FILL, 1), {}),
+    'snapshot': (drawing.draw_snapshot, (FILL,), {'path': 'snapshot_files', 'panel': 'left', 'file': 'zigzag.json'}),
+    'ids': (drawing.draw_ids, ('cpu', 'mem-bat', FILL), {}),
+}
+
+
+@pytest.fixture(autouse=True)
+def fixed_clock(monkeypatch):
+    # draw_battery flashes and pulses with the wall clock
+    monkeypatch.setattr(drawing.time, 'time', lambda: 1000.0)
+
+
+def check_golden(name, grid):
+    golden_file = GOLDEN_DIR / f'{name}.json'
+    if os.environ.get('UPDATE_GOLDEN'):
+        golden_file.write_text(json.dumps(np.asarray(grid).tolist()))
+    golden = np.array(json.loads(golden_file.read_text()))
+    np.testing.assert_array_equal(grid, golden, err_msg=f"{name} no longer matches {golden_file.name}")
+
+
+@pytest.mark.parametrize('name', CASES)
+def test_renderer(benchmark, name):
+    renderer, args, kwargs = CASES[name]
+    grid = drawing.FrameRing(size=1).frame()
+
+    def render():
+        grid[:, :] = 0
+        renderer(grid, *args, **kwargs)
+
+    benchmark.group = renderer.__name__
+    benchmark(render)
+    check_golden(name, grid)
+
+
+def test_every_renderer_is_covered():
+    covered = {renderer for renderer, _, _ in CASES.values()}
+    missing = {
+        app for app, funcs in drawing.direct_draw_funcs.items()
+        if funcs['fn'] not in covered and funcs['fn'].__name__ != '<lambda>'
+    }
+    assert not missing, f"Add benchmark cases for the renderers of: {sorted(missing)}"
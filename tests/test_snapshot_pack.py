@@ -0,0 +1,58 @@
+# Snapshot packs (snapshot_pack.py) must draw exactly what the json snapshots they were compiled from draw.
+
+# Built In Dependencies
+from pathlib import Path
+
+# External Dependencies
+import numpy as np
+import pytest
+
+# Internal Dependencies
+from led_mon import drawing
+from led_mon.snapshot_pack import compile_pack, SnapshotPack, FORMATS
+
+SNAPSHOT_DIR = Path(drawing.__file__).parent / 'snapshot_files'
+SNAPSHOTS = sorted(p.relative_to(SNAPSHOT_DIR).as_posix() for p in SNAPSHOT_DIR.glob('*/*.json'))
+
+
+@pytest.fixture(scope='module', params=[f for f in FORMATS if f != 'auto'])
+def pack_file(request, tmp_path_factory):
+    pack_file = tmp_path_factory.mktemp('packs') / f'snapshots-{request.param}.ledpack'
+    compile_pack(SNAPSHOT_DIR, pack_file, request.param)
+    return pack_file
+
+
+@pytest.mark.parametrize('name', SNAPSHOTS)
+def test_pack_matches_json(pack_file, name):
+    panel, file = name.split('/')
+    np.testing.assert_array_equal(
+        drawing.load_snapshot(str(pack_file), panel, file),
+        drawing.load_snapshot('snapshot_files', panel, file),
+    )
+
+
+def test_uint8_frames_are_views(pack_file):
+    pack = SnapshotPack(pack_file)
+    frames = pack.frames(SNAPSHOTS[0])
+    assert not frames.flags.writeable
+    if pack.entries[SNAPSHOTS[0]]['format'] == 'uint8':
+        assert frames.base is not None and frames.shape == (1, 9, 34)
+
+
+def test_draw_from_pack(benchmark, pack_file):
+    grid = drawing.FrameRing(size=1).frame()
+    kwargs = {'path': str(pack_file), 'panel': 'left', 'file': 'zigzag.json'}
+    benchmark.group = 'draw_snapshot'
+    benchmark(drawing.draw_snapshot, grid, 100, **kwargs)
+    expected = drawing.FrameRing(size=1).frame()
+    drawing.draw_snapshot(expected, 100, path='snapshot_files', panel='left', file='zigzag.json')
+    np.testing.assert_array_equal(grid, expected)
+
+
+@pytest.mark.parametrize('pixel, fill_value', [(2, 200), (200, 200), (255, 255)])
+def test_greyscale_snapshot_does_not_wrap(tmp_path, pixel, fill_value):
+    (tmp_path / 'grey.json').write_text(str([[pixel] * drawing.PANEL_WIDTH] * drawing.PANEL_HEIGHT))
+    grid = drawing.FrameRing(size=1).frame()
+    drawing.draw_snapshot(grid, fill_value, path=str(tmp_path), file='grey.json')
+    # Products past uint8 and int16 saturate at full brightness instead of wrapping
+    assert (grid == 255).all()
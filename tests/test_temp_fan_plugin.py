@@ -0,0 +1,74 @@
+# temp/fan plugin: each chips/labels selection reads through its own hwmon index.
+
+# Built In Dependencies
+import os
+import errno
+
+# External Dependencies
+import pytest
+
+# Internal Dependencies
+from led_mon.plugins import temp_fan_plugin
+
+# chip name -> [(label, millidegrees), ...]
+CHIPS = {
+    'k10temp': [('Tctl', 60000), ('Tccd1', 50000)],
+    'nvme': [('Composite', 40000)],
+}
+
+
+@pytest.fixture
+def hwmon(tmp_path, monkeypatch):
+    for i, (name, inputs) in enumerate(CHIPS.items()):
+        chip = tmp_path / f'hwmon{i}'
+        chip.mkdir()
+        (chip / 'name').write_text(f'{name}\n')
+        for n, (label, value) in enumerate(inputs, start=1):
+            (chip / f'temp{n}_label').write_text(f'{label}\n')
+            (chip / f'temp{n}_input').write_text(f'{value}\n')
+    monkeypatch.setattr(temp_fan_plugin, 'HWMON_DIR', str(tmp_path))
+    monkeypatch.setattr(temp_fan_plugin, 'sampled_monitors', dict(temp_fan_plugin.sampled_monitors))
+    return tmp_path
+
+
+def test_selections_get_their_own_monitor(hwmon):
+    tctl = temp_fan_plugin.get_sampled_monitor('temp', ['k10temp'], ['Tctl'])
+    nvme = temp_fan_plugin.get_sampled_monitor('temp', 'nvme')
+    assert temp_fan_plugin.get_sampled_monitor('temp', ('k10temp',), ('Tctl',)) is tctl
+    assert tctl is not nvme and tctl is not temp_fan_plugin.get_sampled_monitor('temp')
+
+    ref = temp_fan_plugin.TEMP_REF
+    # Reading one selection leaves the others' indexes alone
+    for _ in range(2):
+        assert tctl.get() == pytest.approx([60 / ref])
+        assert nvme.get() == pytest.approx([40 / ref])
+    assert temp_fan_plugin.TemperatureMonitor().get() == pytest.approx([55 / ref, 40 / ref])
+
+
+def test_rebound_chip_is_reopened(hwmon, monkeypatch):
+    real_pread = os.pread
+
+    def sysfs_pread(fd, n, offset):
+        # Like sysfs after a driver unbind: inputs of a removed device fail instead of reading stale values
+        if os.fstat(fd).st_nlink == 0:
+            raise OSError(errno.ENODEV, 'No such device')
+        return real_pread(fd, n, offset)
+
+    monkeypatch.setattr(temp_fan_plugin.os, 'pread', sysfs_pread)
+    monkeypatch.setattr(temp_fan_plugin, 'HWMON_ERROR_RESCAN_SEC', 0)
+    sensors = temp_fan_plugin.HwmonSensors('temp', scale=1000, chips=('nvme',))
+    assert sensors.read() == [('nvme', [40.0])]
+    (stale_fd,) = sensors.groups[0][1]
+
+    # The chip is rebound under the same hwmonN name, so the listing does not change
+    input_file = hwmon / 'hwmon1' / 'temp1_input'
+    input_file.unlink()
+    input_file.write_text('45000\n')
+    assert sensors.read() == []
+    with pytest.raises(OSError):
+        os.fstat(stale_fd)
+    assert sensors.read() == [('nvme', [45.0])]
+    # Reads go back to the open inputs, without listing the hwmon dir again
+    next_scan = sensors.next_scan
+    assert sensors.read() == [('nvme', [45.0])]
+    assert sensors.next_scan == next_scan
@@ -0,0 +1,58 @@
+# Micro-benchmark for the equalizer's per-frame band energy cost.
+# Compares designing the EasyEffects-mode filters on every frame (the old behavior)
+# with the cached filter banks and the FFT engine.
+#
+#   python utils/bench_eq_filters.py [frames]
+
+# Built In Dependencies
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# External Dependencies
+import numpy as np
+from scipy.signal import butter, sosfiltfilt
+
+# Internal Dependencies
+from led_mon.equalizer_files.band_engines import (
+    IIRBandEngine, FFTBandEngine, centered_band_edges, design_filter_bank
+)
+
+SAMPLE_RATE = 48000
+CHUNK_SIZE = 1024
+BAND_CENTERS = [31.5, 63, 125, 250, 500, 1000, 2000, 4000, 8000]
+EXTERNAL_EDGES = centered_band_edges(BAND_CENTERS, 0.75, 1.35)
+
+
+def uncached_frame(chunk):
+    # What update_leds used to do for every frame with external-filter enabled
+    levels = []
+    for low, high in EXTERNAL_EDGES:
+        sos = butter(2, [low, high], btype='band', fs=SAMPLE_RATE, output='sos')
+        levels.append(np.sqrt(np.mean(sosfiltfilt(sos, chunk) ** 2)))
+    return levels
+
+def design_only():
+    for low, high in EXTERNAL_EDGES:
+        butter(2, [low, high], btype='band', fs=SAMPLE_RATE, output='sos')
+
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    chunk = (np.random.default_rng(0).standard_normal(CHUNK_SIZE) * 0.1).astype(np.float32)
+    iir = IIRBandEngine(EXTERNAL_EDGES, SAMPLE_RATE, order=2)
+    fft = FFTBandEngine(EXTERNAL_EDGES, SAMPLE_RATE, CHUNK_SIZE)
+
+    cases = [
+        ("design per frame (butter only)", design_only),
+        ("design per frame + sosfiltfilt (before)", lambda: uncached_frame(chunk)),
+        ("cached design lookup", lambda: design_filter_bank(EXTERNAL_EDGES, SAMPLE_RATE, 2)),
+        ("cached design + sosfiltfilt (after, iir)", lambda: iir.band_rms(chunk)),
+        ("fft engine (after, fft)", lambda: fft.band_rms(chunk)),
+    ]
+    print(f"Per-frame cost over {frames} frames ({CHUNK_SIZE} samples, 9 bands)")
+    for name, fn in cases:
+        per_frame = timeit.timeit(fn, number=frames) / frames
+        print(f"   {name.ljust(42)}{per_frame * 1e6:10.1f} us")